@@ -2,6 +2,8 @@ import os
 import logging
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import inspect, text
+from sqlalchemy.schema import CreateIndex
 from sqlalchemy.orm import DeclarativeBase
 from werkzeug.middleware.proxy_fix import ProxyFix
 from config import Config
@@ -37,6 +39,62 @@ with app.app_context():
     import models  # noqa: F401
     import models_learning  # noqa: F401
     db.create_all()
+    
+    # Columns added after the table existed. create_all() doesn't alter existing tables,
+    # so any that are missing are added (nullable, no default) before anything queries them.
+    resume_table = db.metadata.tables['resume_analysis']
+    existing_columns = {column['name'] for column in inspect(db.engine).get_columns('resume_analysis')}
+    for column_name in (
+        'scout_summary',             # friendly summary produced during extraction
+        'candidate_embedding',       # recommendation prefilter vector (BLOB / BYTEA)
+        'candidate_embedding_hash',  # detects profiles edited since they were embedded
+    ):
+        if column_name in existing_columns:
+            continue
+        column_type = resume_table.columns[column_name].type.compile(dialect=db.engine.dialect)
+        try:
+            with db.engine.begin() as conn:
+                conn.execute(text(f'ALTER TABLE resume_analysis ADD COLUMN {column_name} {column_type}'))
+        except Exception as e:
+            logging.warning(f"Could not add column resume_analysis.{column_name}: {e}")
+    
+    # Indexes added after the tables existed. create_all() doesn't add indexes to
+    # existing tables, so the ones declared on the models are created idempotently.
+    model_indexes = {ix.name: ix for table in db.metadata.tables.values() for ix in table.indexes}
+    for index_name in (
+        'ix_candidate_status_rating',   # best-rated active candidates
+        'ix_candidate_status_upload',   # dashboard status / upload date filters
+        'ix_candidate_source_status',   # dashboard source effectiveness
+        'ix_candidate_upload_date_id',  # keyset pagination of date-sorted candidate search
+        'ix_skill_name_candidate',      # dashboard skill demand join
+        'ix_skill_name_lower',          # case-insensitive candidate database skill search
+        'ix_task_overdue',              # overdue task counts (partial on PostgreSQL)
+    ):
+        try:
+            with db.engine.begin() as conn:
+                conn.execute(CreateIndex(model_indexes[index_name], if_not_exists=True))
+        except Exception as e:
+            logging.warning(f"Could not create index {index_name}: {e}")
+    
+    # PostgreSQL-only indexes: trigram indexes so ILIKE '%...%' filters on location and
+    # resume text (candidate database skill/keyword/location search) can use an index
+    # instead of a seq scan, and floor(rating) for the dashboard's rating bands. Each
+    # runs in its own transaction so a missing pg_trgm doesn't block the others.
+    if db.engine.dialect.name == 'postgresql':
+        for statement in (
+            'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+            'CREATE INDEX IF NOT EXISTS ix_resume_analysis_location_trgm '
+            'ON resume_analysis USING gin (location gin_trgm_ops)',
+            'CREATE INDEX IF NOT EXISTS ix_resume_analysis_resume_text_trgm '
+            'ON resume_analysis USING gin (resume_text gin_trgm_ops)',
+            'CREATE INDEX IF NOT EXISTS ix_candidate_fit_floor '
+            'ON resume_analysis (floor(overall_fit_rating))',
+        ):
+            try:
+                with db.engine.begin() as conn:
+                    conn.execute(text(statement))
+            except Exception as e:
+                logging.warning(f"Could not run '{statement}': {e}")
 
 # Import and register routes
 import routes  # noqa: F401
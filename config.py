@@ -22,6 +22,8 @@ class Config:
     # Core AI Service
     OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
     XAI_API_KEY = os.getenv('XAI_API_KEY')  # For Grok AI model
+    SCOUT_MODEL = os.getenv('SCOUT_MODEL', 'gpt-4o-mini')  # Scout summaries and chat replies
+    SCOUT_COMPLEX_MODEL = os.getenv('SCOUT_COMPLEX_MODEL', 'gpt-4o')  # Long or analytical chat requests
     
     # Job Search APIs
     RAPIDAPI_KEY = os.getenv('RAPIDAPI_KEY')  # For JSearch
@@ -31,7 +33,13 @@ class Config:
     USAJOBS_USER_AGENT = os.getenv('USAJOBS_USER_AGENT', 'TradesCompass')
     
     # External Sourcing APIs
-    GITHUB_TOKEN = os.getenv('GITHUB_TOKEN')
+    # GITHUB_TOKENS takes a comma-separated list; searches rotate through them so each
+    # token's hourly rate limit adds up. A single GITHUB_TOKEN still works on its own.
+    GITHUB_TOKENS = [
+        token.strip() for token in os.getenv('GITHUB_TOKENS', os.getenv('GITHUB_TOKEN', '')).split(',')
+        if token.strip()
+    ]
+    GITHUB_TOKEN = os.getenv('GITHUB_TOKEN') or next(iter(GITHUB_TOKENS), None)
     PEOPLEDATA_KEY = os.getenv('PEOPLEDATA_KEY')
     SEEKOUT_API_KEY = os.getenv('SEEKOUT_API_KEY')
     SOURCEHUB_API_KEY = os.getenv('SOURCEHUB_API_KEY')
@@ -1,6 +1,6 @@
 from app import db
 from datetime import datetime
-from sqlalchemy import Text, Index
+from sqlalchemy import Text, Index, text
 
 class ResumeAnalysis(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -26,6 +26,9 @@ class ResumeAnalysis(db.Model):
     reward_factor_explanation = db.Column(Text)
     overall_fit_rating = db.Column(db.Float, index=True)
     justification = db.Column(Text)
+    scout_summary = db.Column(Text)  # Friendly summary produced during extraction
+    candidate_embedding = db.Column(db.LargeBinary)  # float32 unit vector (text-embedding-3-small) for recommendation prefiltering
+    candidate_embedding_hash = db.Column(db.String(40))  # hash of the text candidate_embedding was computed from
     
     # Job matching data
     relevant_jobs = db.Column(Text)  # JSON string of job matches from multiple sources
@@ -53,6 +56,10 @@ class ResumeAnalysis(db.Model):
     __table_args__ = (
         Index('ix_candidate_ratings', 'overall_fit_rating', 'risk_factor_score', 'reward_factor_score'),
         Index('ix_candidate_upload_date', 'upload_date'),
+        Index('ix_candidate_status_rating', 'status', 'overall_fit_rating'),
+        Index('ix_candidate_status_upload', 'status', 'upload_date'),
+        Index('ix_candidate_source_status', 'source', 'status'),
+        Index('ix_candidate_upload_date_id', 'upload_date', 'id'),
     )
     
     def to_dict(self):
@@ -88,6 +95,8 @@ class CandidateSkill(db.Model):
     __table_args__ = (
         db.UniqueConstraint('candidate_id', 'skill_name'),
         Index('ix_skill_search', 'skill_name', 'skill_level'),
+        Index('ix_skill_name_candidate', 'skill_name', 'candidate_id'),
+        Index('ix_skill_name_lower', text('lower(skill_name)')),
     )
     
     def __repr__(self):
@@ -196,6 +205,7 @@ class RecruiterTask(db.Model):
     __table_args__ = (
         Index('ix_task_status_due', 'status', 'due_date'),
         Index('ix_task_assigned', 'assigned_to', 'status'),
+        Index('ix_task_overdue', 'due_date', postgresql_where=text("status != 'completed'")),
     )
     
     def is_overdue(self):
@@ -108,6 +108,7 @@ def upload_file():
                 reward_factor_explanation=analysis_result.get('reward_factor', {}).get('explanation'),
                 overall_fit_rating=analysis_result.get('overall_fit_rating'),
                 justification=analysis_result.get('justification_for_rating'),
+                scout_summary=candidate_info.get('scout_summary'),
                 relevant_jobs=json.dumps(relevant_jobs),
                 source='manual_upload'
             )
@@ -386,13 +387,15 @@ def api_search_candidates():
     min_fit_rating = request.args.get('min_fit_rating', type=float)
     max_risk_score = request.args.get('max_risk_score', type=float)
     page = request.args.get('page', 1, type=int)
+    cursor = request.args.get('cursor') or None
     
     results = search_candidates(
         skills=skills if skills else None,
         min_fit_rating=min_fit_rating,
         max_risk_score=max_risk_score,
         page=page,
-        per_page=10
+        per_page=10,
+        cursor=cursor
     )
     
     return jsonify(results)
@@ -3,10 +3,11 @@ AI Assistant Routes for TradesCompass Pro
 Handles the playful AI assistant interactions
 """
 
-from flask import render_template, request, jsonify, session
+from flask import render_template, request, jsonify, session, Response, stream_with_context
 from app import app, db
 from models import ResumeAnalysis
 from services.ai_assistant import RecruitmentAssistant
+import json
 import logging
 
 # Initialize the assistant
@@ -81,6 +82,27 @@ def ai_assistant_chat():
         'suggestions': assistant.suggest_next_action(context) if context else None
     })
 
+@app.route('/api/ai-assistant/chat/stream', methods=['POST'])
+def ai_assistant_chat_stream():
+    """Stream chat replies as server-sent events so the first words render immediately"""
+    data = request.json
+    user_message = data.get('message', '')
+    context = data.get('context', {})
+    
+    if not user_message:
+        return jsonify({'error': 'No message provided'}), 400
+    
+    def generate():
+        for event in assistant.stream_conversation_response(user_message, context):
+            if event.get('done'):
+                # Same extras as the non-streaming chat endpoint, sent with the final event
+                if not event.get('external_search') and any(word in user_message.lower() for word in ['find', 'search', 'looking for', 'need']):
+                    event['intent'] = assistant.analyze_search_intent(user_message)
+                event['suggestions'] = assistant.suggest_next_action(context) if context else None
+            yield f"data: {json.dumps(event)}\n\n"
+    
+    return Response(stream_with_context(generate()), mimetype='text/event-stream')
+
 @app.route('/api/ai-assistant/analyze-search', methods=['POST'])
 def analyze_search():
     """Analyze a search query and provide guidance"""
@@ -98,29 +120,61 @@ def analyze_search():
     
     return jsonify(analysis)
 
-@app.route('/api/ai-assistant/candidate-summary/<int:candidate_id>')
-def get_candidate_summary(candidate_id):
-    """Get an AI-generated summary of a candidate"""
-    candidate = ResumeAnalysis.query.get_or_404(candidate_id)
-    
-    # Convert to dict for assistant
-    candidate_dict = {
+def _candidate_summary_input(candidate):
+    """Convert a candidate record to the dict the assistant summarizes"""
+    return {
         'first_name': candidate.first_name,
         'last_name': candidate.last_name,
         'job_title': candidate.job_title,
         'experience_years': candidate.years_of_experience,
         'skills': candidate.skills.split(',') if candidate.skills else [],
         'certifications': [candidate.licenses, candidate.certifications] if candidate.licenses or candidate.certifications else [],
-        'location': candidate.location
+        'location': candidate.location,
+        'scout_summary': candidate.scout_summary
     }
+
+@app.route('/api/ai-assistant/candidate-summary/<int:candidate_id>')
+def get_candidate_summary(candidate_id):
+    """Get an AI-generated summary of a candidate"""
+    candidate = ResumeAnalysis.query.get_or_404(candidate_id)
     
-    summary = assistant.generate_candidate_summary(candidate_dict)
+    summary = assistant.generate_candidate_summary(_candidate_summary_input(candidate))
     
     # Update session
     session['candidates_viewed'] = session.get('candidates_viewed', 0) + 1
     
     return jsonify({'summary': summary})
 
+@app.route('/api/ai-assistant/candidate-summaries', methods=['POST'])
+def get_candidate_summaries():
+    """Get AI-generated summaries for several candidates in one call"""
+    data = request.json
+    candidate_ids = data.get('candidate_ids', [])
+    
+    if not candidate_ids:
+        return jsonify({'error': 'No candidate_ids provided'}), 400
+    
+    candidates = ResumeAnalysis.query.filter(ResumeAnalysis.id.in_(candidate_ids)).all()
+    summaries = assistant.generate_candidate_summaries([_candidate_summary_input(c) for c in candidates])
+    
+    return jsonify({'summaries': {c.id: summary for c, summary in zip(candidates, summaries)}})
+
+@app.route('/api/ai-assistant/candidate-summary/<int:candidate_id>/stream')
+def stream_candidate_summary(candidate_id):
+    """Stream an AI-generated summary of a candidate as server-sent events"""
+    candidate = ResumeAnalysis.query.get_or_404(candidate_id)
+    candidate_dict = _candidate_summary_input(candidate)
+    
+    # Update session
+    session['candidates_viewed'] = session.get('candidates_viewed', 0) + 1
+    
+    def generate():
+        for delta in assistant.stream_candidate_summary(candidate_dict):
+            yield f"data: {json.dumps({'delta': delta})}\n\n"
+        yield f"data: {json.dumps({'done': True})}\n\n"
+    
+    return Response(stream_with_context(generate()), mimetype='text/event-stream')
+
 @app.route('/api/ai-assistant/matching-tips', methods=['POST'])
 def get_matching_tips():
     """Get tips for better candidate matching"""
@@ -8,9 +8,56 @@ from openai import OpenAI
 OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
 openai = OpenAI(api_key=OPENAI_API_KEY)
 
+# Batch extraction limits: resumes per request and approximate input tokens per request
+BATCH_MAX_RESUMES = 10
+BATCH_MAX_TOKENS = 100000
+
+# Resumes longer than this are trimmed to head + tail before being sent
+MAX_RESUME_TOKENS = 6000
+CHARS_PER_TOKEN = 4
+
+EXTRACT_FIELDS_EXAMPLE = """{
+  "first_name": "John",
+  "last_name": "Doe", 
+  "email": "john.doe@email.com",
+  "phone": "+1-555-123-4567",
+  "location": "San Francisco, CA",
+  "extracted_skills": ["Python", "Machine Learning", "AWS", "React", "SQL"],
+  "scout_summary": "John is a licensed electrician with 8 years of commercial experience and an OSHA 30 card."
+}"""
+
+def estimate_tokens(text):
+    """Rough token count for prompt budgeting (~4 characters per token for English text)"""
+    return len(text or '') // CHARS_PER_TOKEN + 1
+
+def truncate_to_tokens(text, max_tokens):
+    """Keep the head and tail of text when it exceeds max_tokens
+    
+    Contact details usually sit at the top of a resume and recent certifications
+    or references at the bottom, so the middle is what gets dropped.
+    """
+    if not text or estimate_tokens(text) <= max_tokens:
+        return text
+    keep = max_tokens * CHARS_PER_TOKEN // 2
+    return f"{text[:keep]}\n... [truncated] ...\n{text[-keep:]}"
+
+def _empty_candidate_info():
+    """Candidate info record used when extraction fails"""
+    return {
+        "first_name": None,
+        "last_name": None,
+        "email": None,
+        "phone": None,
+        "location": None,
+        "extracted_skills": [],
+        "scout_summary": None
+    }
+
 def analyze_resume(resume_text, job_description):
     """Analyze resume against job description using OpenAI"""
     try:
+        resume_text = truncate_to_tokens(resume_text, MAX_RESUME_TOKENS)
+        
         system_prompt = """# Overview
 You are an expert trades and construction recruiter specializing in skilled tradesmen including electricians, plumbers, HVAC technicians, carpenters, masons, roofers, window/door installers, and other construction professionals. You have been given a job description and a candidate resume. Your task is to analyze the resume in relation to the job description and provide a detailed screening report.
 
@@ -71,19 +118,16 @@ Please analyze this candidate's resume against the job description and provide a
 def extract_candidate_info(resume_text):
     """Extract candidate contact information from resume"""
     try:
+        resume_text = truncate_to_tokens(resume_text, MAX_RESUME_TOKENS)
+        
         system_prompt = """You are an expert at extracting contact information from skilled trades and construction resumes. Extract the candidate's first name, last name, email address, phone number, location, and key trade skills from the resume text.
 
 Also identify the top 5 most relevant trade skills, certifications, and licenses mentioned in the resume. Look specifically for: OSHA certifications, state licenses (electrical, plumbing, HVAC, contractor), EPA certifications, union affiliations, and specific trade skills.
 
+Finally, write a "scout_summary": a brief, friendly and professional summary of the candidate (under 3 sentences) that highlights their key strengths and what makes them a good fit for trades work.
+
 Respond with JSON in this exact format:
-{
-  "first_name": "John",
-  "last_name": "Doe", 
-  "email": "john.doe@email.com",
-  "phone": "+1-555-123-4567",
-  "location": "San Francisco, CA",
-  "extracted_skills": ["Python", "Machine Learning", "AWS", "React", "SQL"]
-}
+""" + EXTRACT_FIELDS_EXAMPLE + """
 
 If any information is not found, use null for that field."""
 
@@ -106,11 +150,73 @@ If any information is not found, use null for that field."""
         
     except Exception as e:
         logging.error(f"Error extracting candidate info: {str(e)}")
-        return {
-            "first_name": None,
-            "last_name": None,
-            "email": None,
-            "phone": None,
-            "location": None,
-            "extracted_skills": []
-        }
+        return _empty_candidate_info()
+
+def extract_candidate_info_batch(resume_texts):
+    """Extract candidate information from several resumes with one OpenAI call per chunk
+    
+    Resumes are grouped so that each request stays under BATCH_MAX_RESUMES resumes
+    and BATCH_MAX_TOKENS estimated input tokens. Returns one result per input
+    resume, in the same order as resume_texts. Each resume is truncated to
+    MAX_RESUME_TOKENS first, so chunking is budgeted on what is actually sent.
+    """
+    resume_texts = [truncate_to_tokens(text, MAX_RESUME_TOKENS) for text in resume_texts]
+    results = [None] * len(resume_texts)
+    
+    chunk = []
+    chunk_tokens = 0
+    for index, text in enumerate(resume_texts):
+        tokens = estimate_tokens(text)
+        if chunk and (len(chunk) >= BATCH_MAX_RESUMES or chunk_tokens + tokens > BATCH_MAX_TOKENS):
+            _extract_chunk(resume_texts, chunk, results)
+            chunk = []
+            chunk_tokens = 0
+        chunk.append(index)
+        chunk_tokens += tokens
+    if chunk:
+        _extract_chunk(resume_texts, chunk, results)
+    
+    return results
+
+def _extract_chunk(resume_texts, indexes, results):
+    """Run one batched extraction request and store results by resume index"""
+    try:
+        system_prompt = """You are an expert at extracting contact information from skilled trades and construction resumes. You will be given several resumes, each introduced by a "===RESUME n===" marker. For each resume extract the candidate's first name, last name, email address, phone number, location, and the top 5 most relevant trade skills, certifications, and licenses (OSHA certifications, state licenses, EPA certifications, union affiliations, specific trade skills). Also write a "scout_summary": a brief, friendly and professional summary of the candidate (under 3 sentences).
+
+Respond with JSON in this exact format, with one entry per resume and "resume_id" set to the number from its marker:
+{"candidates": [{"resume_id": 0, ...fields...}]}
+
+Each entry has these fields:
+""" + EXTRACT_FIELDS_EXAMPLE + """
+
+If any information is not found, use null for that field."""
+        
+        user_prompt = "".join(f"\n\n===RESUME {index}===\n{resume_texts[index]}" for index in indexes)
+        
+        response = openai.chat.completions.create(
+            model="gpt-4o",
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            response_format={"type": "json_object"},
+            temperature=0.1
+        )
+        
+        content = response.choices[0].message.content
+        if not content:
+            raise Exception("Empty response from OpenAI")
+        
+        for candidate in json.loads(content).get('candidates', []):
+            resume_id = candidate.pop('resume_id', None)
+            if str(resume_id).isdigit() and int(resume_id) in indexes:
+                resume_id = int(resume_id)
+                results[resume_id] = candidate
+    
+    except Exception as e:
+        logging.error(f"Error extracting candidate info batch: {str(e)}")
+    
+    # Resumes the model skipped (or a failed request) fall back to the empty record
+    for index in indexes:
+        if results[index] is None:
+            results[index] = _empty_candidate_info()
@@ -3,24 +3,264 @@ AI Assistant Service for TradesCompass Pro
 Provides a friendly, conversational AI guide for recruiters
 """
 
+import bisect
+import functools
+import hashlib
 import json
 import logging
+import math
+import operator
 import random
-from typing import Dict, List, Any, Optional
+import re
+import threading
+import time
+from array import array
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from types import MappingProxyType
+from typing import Dict, List, Any, Iterator, Optional
 from datetime import datetime
 from config import Config
-from openai import OpenAI
-from services.candidate_sourcing import CandidateSourcingService
 from services.enhanced_sourcing import EnhancedSourcingService
 from services.learning_engine import LearningEngine
 
+# One OpenAI client per process so requests reuse warm keep-alive connections
+# instead of paying a new TLS handshake for every assistant instance. It is
+# created on first use so processes that never chat don't load openai/httpx.
+_OPENAI_CLIENT = None
+_OPENAI_CLIENT_LOCK = threading.Lock()
+
+def _shared_openai_client():
+    """Return the process-wide OpenAI client, or None without an API key"""
+    global _OPENAI_CLIENT
+    if _OPENAI_CLIENT is None and Config.OPENAI_API_KEY:
+        with _OPENAI_CLIENT_LOCK:
+            if _OPENAI_CLIENT is None:
+                import httpx
+                from openai import OpenAI
+                _OPENAI_CLIENT = OpenAI(
+                    api_key=Config.OPENAI_API_KEY,
+                    http_client=httpx.Client(
+                        timeout=30,
+                        limits=httpx.Limits(max_connections=64, max_keepalive_connections=32, keepalive_expiry=60)
+                    )
+                )
+    return _OPENAI_CLIENT
+
+# Marks a lazily created attribute that hasn't been created yet (None is a valid value)
+_UNSET = object()
+
+# Keyword tables used by analyze_search_intent (built once at import time)
+TRADE_KEYWORDS = MappingProxyType({
+    'electrician': ('electrical', 'electrician', 'journeyman electrician', 'master electrician'),
+    'hvac': ('hvac', 'heating', 'cooling', 'air conditioning', 'refrigeration'),
+    'plumber': ('plumber', 'plumbing', 'pipefitter', 'pipe'),
+    'carpenter': ('carpenter', 'carpentry', 'framing', 'finishing'),
+    'window': ('window', 'door', 'glazier', 'installation'),
+    'general': ('construction', 'laborer', 'general contractor')
+})
+
+CERTIFICATION_KEYWORDS = MappingProxyType({
+    'OSHA': ('osha', 'osha 10', 'osha 30', 'osha 40'),
+    'EPA': ('epa', 'epa certified', '608', '609'),
+    'State License': ('licensed', 'license', 'journeyman', 'master'),
+    'DOT': ('dot', 'cdl', 'commercial driver')
+})
+
+# Experience levels are matched against query tokens, so phrases like
+# "10+ years" are reduced to their distinguishing token ("10+")
+SENIOR_WORDS = frozenset({'senior', 'experienced', 'veteran', '10+', '15+'})
+JUNIOR_WORDS = frozenset({'junior', 'entry', 'apprentice', 'helper'})
+MID_WORDS = frozenset({'mid', 'journeyman', '5+'})
+
+EXPERIENCE_LEVEL_TEXT = MappingProxyType({
+    'senior': 'seasoned professionals with 10+ years',
+    'mid': 'skilled journeymen with 5-10 years',
+    'junior': 'eager apprentices and helpers'
+})
+
+# Search parameters used by search_external_candidates for basic sourcing
+_JOB_TITLES = MappingProxyType({
+    'electrician': 'Electrician',
+    'hvac': 'HVAC Technician',
+    'plumber': 'Plumber',
+    'carpenter': 'Carpenter',
+    'window': 'Window Installer',
+    'general': 'Construction Worker'
+})
+
+_EXPERIENCE_MAP = MappingProxyType({
+    'senior': 10,
+    'mid': 5,
+    'junior': 1
+})
+
+_QUERY_TOKEN_RE = re.compile(r"[a-z0-9+]+")
+
+def _keyword_index(table):
+    """Build a reverse index keyword -> label from a label -> keywords table
+    
+    Keywords that contain a shorter keyword of the same label are left out
+    since the shorter keyword already reports that label.
+    """
+    index = {}
+    for label, keywords in table.items():
+        for keyword in keywords:
+            if not any(other != keyword and other in keyword for other in keywords):
+                index[keyword] = label
+    return MappingProxyType(index)
+
+_KEYWORD_TO_TRADE = _keyword_index(TRADE_KEYWORDS)
+_KEYWORD_TO_CERT = _keyword_index(CERTIFICATION_KEYWORDS)
+
+# Finds every indexed keyword in one pass over the query. The lookahead lets
+# overlapping keywords match, and longer keywords are tried first.
+_INTENT_SCANNER = re.compile('(?=({}))'.format('|'.join(
+    re.escape(keyword) for keyword in sorted({**_KEYWORD_TO_TRADE, **_KEYWORD_TO_CERT}, key=len, reverse=True)
+)))
+
+# Phrases that mean the recruiter wants candidates from outside the database
+EXTERNAL_SEARCH_KEYWORDS = (
+    'find candidates', 'search for', 'look for', 'find me',
+    'source', 'external', 'outside', 'new candidates',
+    'more candidates', 'additional candidates', 'other candidates',
+    'github', 'linkedin', 'online', 'web', 'internet',
+    'expand search', 'broader search', 'wider search'
+)
+_EXTERNAL_SEARCH_RE = re.compile('|'.join(re.escape(keyword) for keyword in EXTERNAL_SEARCH_KEYWORDS))
+
+# A single search phrase only triggers an external search when the message
+# also names a trade or certification ("find me an electrician", not
+# "find me a coffee")
+EXTERNAL_SEARCH_MIN_MATCHES = 2
+
+# At most this many external searches per assistant within the window (seconds)
+EXTERNAL_SEARCH_RATE_LIMIT = 5
+EXTERNAL_SEARCH_RATE_WINDOW = 60
+
+# Fallback summary wording by years of experience: <=5, 6-10, >10
+EXPERIENCE_BUCKETS = (5, 10)
+EXPERIENCE_TEMPLATES = (
+    "{trade} with {years} years",
+    "experienced {trade} with {years} years",
+    "veteran {trade} with {years}+ years"
+)
+
+# Reused encoders: json.dumps builds a new JSONEncoder on every call that
+# passes options. Compact separators also keep batch prompts shorter.
+_PROMPT_JSON = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False, default=str)
+_CACHE_KEY_JSON = json.JSONEncoder(separators=(',', ':'), sort_keys=True, default=str)
+
+# Number of AI candidate summaries kept in memory
+SUMMARY_CACHE_SIZE = 4096
+
+# Candidates summarized per OpenAI request by generate_candidate_summaries
+SUMMARY_BATCH_SIZE = 8
+
+# Output caps sized to what the UI renders. Summaries are single short
+# paragraphs, so a blank line ends them; chat replies may have paragraphs.
+SUMMARY_MAX_TOKENS = 90
+SUMMARY_TEMPERATURE = 0.4
+CHAT_MAX_TOKENS = 160
+
+# Semantic cache for chat replies: recent prompts are embedded and a new prompt
+# reuses the stored reply when its page context is identical and its cosine
+# similarity reaches the threshold
+SEMANTIC_CACHE_SIZE = 512
+SEMANTIC_CACHE_THRESHOLD = 0.92
+EMBEDDING_MODEL = 'text-embedding-3-small'
+
+# External searches run here so the chat reply can start while they are in flight
+_SEARCH_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix='scout-search')
+
+# Chat messages at least this long, or containing one of these phrases, go to
+# Config.SCOUT_COMPLEX_MODEL instead of the smaller default model
+COMPLEX_MESSAGE_LENGTH = 120
+COMPLEX_REQUEST_RE = re.compile(r"analy[sz]e|compare|evaluate|write (?:a |an |the )?job description|interview plan|strategy")
+
+# Conversation starters and prompts
+GREETINGS = (
+    "Hey there! Ready to find some amazing candidates? 🎯",
+    "Hi! Let's discover your next great hire together!",
+    "Hello! I'm Scout, here to help you find the perfect match.",
+    "Welcome back! Ready to review some talented candidates?",
+    "Hi there! What kind of talent are we looking for today?"
+)
+
+ENCOURAGEMENTS = (
+    "Great choice! Let me help you with that.",
+    "Excellent! I've got some ideas for you.",
+    "Perfect! Let's dive in.",
+    "Awesome! Here's what I found.",
+    "Good thinking! Let me show you the options."
+)
+
+TIPS = (
+    "💡 Tip: Try searching for specific certifications like 'OSHA 30' for safety-conscious candidates.",
+    "💡 Pro tip: Candidates with both residential and commercial experience are often more versatile.",
+    "💡 Quick tip: Check the 'Years of Experience' filter to find seasoned professionals.",
+    "💡 Reminder: Don't forget to review the safety certifications section!",
+    "💡 Insight: Candidates willing to travel often have broader project experience."
+)
+
+# Time-of-day greeting indexed by hour: morning before 12, afternoon before 17
+_HOUR_TO_GREETING = ("Good morning!",) * 12 + ("Good afternoon!",) * 5 + ("Good evening!",) * 7
+
+@functools.lru_cache(maxsize=1)
+def _greeting_for_minute(minute_bucket: int) -> str:
+    """Time-of-day greeting, looked up at most once per minute"""
+    return _HOUR_TO_GREETING[datetime.now().hour]
+
+# Next-action suggestions, already in priority order so suggest_next_action
+# only has to filter them. The tip suggestion is always added last.
+UPLOAD_SUGGESTION = {
+    'action': 'upload_resume',
+    'message': "Let's start by uploading some resumes! You can drag and drop multiple files at once.",
+    'button_text': 'Upload Resumes',
+    'link': '/',
+    'priority': 1
+}
+SEARCH_SUGGESTION = {
+    'action': 'search_candidates',
+    'message': "Now let's search your candidate database. What skills are you looking for?",
+    'button_text': 'Search Candidates',
+    'link': '/candidates',
+    'priority': 1
+}
+FILTER_SUGGESTION = {
+    'action': 'apply_filters',
+    'message': "Try narrowing down your search with filters like location, certifications, or experience level.",
+    'button_text': 'Refine Search',
+    'link': '/candidates',
+    'priority': 2
+}
+REVIEW_MORE_MESSAGE = "You've reviewed {count} candidates. Let's look at a few more to find the perfect match!"
+
+# System prompts are fixed strings so OpenAI can reuse the cached prompt prefix
+# across requests; anything request-specific goes in later messages
+SCOUT_SYSTEM_PROMPT = "You are Scout, a friendly and encouraging recruitment assistant."
+
+SCOUT_CHAT_SYSTEM_PROMPT = """You are Scout, a friendly and helpful recruitment assistant for TradesCompass Pro.
+You help recruiters find skilled trades professionals (electricians, HVAC techs, plumbers, carpenters, etc.).
+Be conversational, encouraging, and professional. Use occasional emojis for friendliness.
+Keep responses concise and actionable. Focus on practical recruiting advice.
+
+If someone asks about finding or searching for candidates, mention that you can search both the internal database
+and external sources including LinkedIn, Indeed Resumes, GitHub, and specialized trade job boards through our
+enhanced AI-powered search capabilities."""
+
+NO_CLIENT_RESPONSE = "I'd love to help, but I need the OpenAI API key configured first. Please add it in your settings!"
+TROUBLE_RESPONSE = "I'm having a bit of trouble right now, but I'm still here to help! What can I assist you with?"
+
 class RecruitmentAssistant:
     """Friendly AI assistant to guide recruiters through the hiring process"""
     
     def __init__(self):
         self.logger = logging.getLogger(__name__)
-        self.client = OpenAI(api_key=Config.OPENAI_API_KEY) if Config.OPENAI_API_KEY else None
-        self.sourcing_service = CandidateSourcingService()
+        
+        # OpenAI client and basic sourcing are set up on first use
+        self._client = _UNSET
+        self._sourcing_service = None
         
         # Initialize enhanced sourcing if xAI or RapidAPI is available
         self.enhanced_sourcing = None
@@ -32,6 +272,24 @@ class RecruitmentAssistant:
         self.learning_engine = LearningEngine()
         self.logger.info("Self-learning engine initialized")
         
+        # AI candidate summaries keyed by candidate fingerprint (LRU order)
+        self._summary_cache = OrderedDict()
+        
+        # (context, normalized message embedding, reply) entries, oldest evicted first.
+        # Requests are served from several threads, so access goes through the lock.
+        self._semantic_cache = deque(maxlen=SEMANTIC_CACHE_SIZE)
+        self._semantic_cache_lock = threading.Lock()
+        
+        # Start times of recent external searches, for rate limiting. The check and
+        # the append happen under the lock so concurrent requests can't both pass.
+        self._external_search_times = deque(maxlen=EXTERNAL_SEARCH_RATE_LIMIT)
+        self._external_search_lock = threading.Lock()
+        
+        # Greetings and tips rotate through a shuffled order so consecutive
+        # requests do not repeat the same line
+        self._greeting_cycle = deque(random.sample(GREETINGS, len(GREETINGS)))
+        self._tip_cycle = deque(random.sample(TIPS, len(TIPS)))
+        
         # Assistant personality traits
         self.personality = {
             'name': 'Scout',
@@ -39,106 +297,81 @@ class RecruitmentAssistant:
             'traits': ['friendly', 'helpful', 'encouraging', 'professional yet casual'],
             'emoji_style': 'occasional',  # Use emojis sparingly for friendliness
         }
-        
-        # Conversation starters and prompts
-        self.greetings = [
-            "Hey there! Ready to find some amazing candidates? 🎯",
-            "Hi! Let's discover your next great hire together!",
-            "Hello! I'm Scout, here to help you find the perfect match.",
-            "Welcome back! Ready to review some talented candidates?",
-            "Hi there! What kind of talent are we looking for today?"
-        ]
-        
-        self.encouragements = [
-            "Great choice! Let me help you with that.",
-            "Excellent! I've got some ideas for you.",
-            "Perfect! Let's dive in.",
-            "Awesome! Here's what I found.",
-            "Good thinking! Let me show you the options."
-        ]
-        
-        self.tips = [
-            "💡 Tip: Try searching for specific certifications like 'OSHA 30' for safety-conscious candidates.",
-            "💡 Pro tip: Candidates with both residential and commercial experience are often more versatile.",
-            "💡 Quick tip: Check the 'Years of Experience' filter to find seasoned professionals.",
-            "💡 Reminder: Don't forget to review the safety certifications section!",
-            "💡 Insight: Candidates willing to travel often have broader project experience."
-        ]
+    
+    @property
+    def client(self):
+        """OpenAI client, or None when no API key is configured"""
+        if self._client is _UNSET:
+            self._client = _shared_openai_client()
+        return self._client
+    
+    @client.setter
+    def client(self, value):
+        self._client = value
+    
+    @property
+    def sourcing_service(self):
+        """Basic candidate sourcing, used when enhanced sourcing is unavailable"""
+        if self._sourcing_service is None:
+            from services.candidate_sourcing import CandidateSourcingService
+            self._sourcing_service = CandidateSourcingService()
+        return self._sourcing_service
+    
+    @staticmethod
+    def _next_in_cycle(cycle: deque) -> str:
+        """Return the next item of a rotation and move it to the back"""
+        item = cycle[0]
+        cycle.rotate(-1)
+        return item
     
     def get_greeting(self, user_context: Dict = None) -> str:
         """Generate a contextual greeting"""
-        current_hour = datetime.now().hour
-        
-        if current_hour < 12:
-            time_greeting = "Good morning!"
-        elif current_hour < 17:
-            time_greeting = "Good afternoon!"
-        else:
-            time_greeting = "Good evening!"
+        time_greeting = _greeting_for_minute(int(time.time() // 60))
         
         if user_context and user_context.get('returning_user'):
-            return f"{time_greeting} Welcome back! {random.choice(self.greetings)}"
+            return f"{time_greeting} Welcome back! {self._next_in_cycle(self._greeting_cycle)}"
         else:
-            return f"{time_greeting} {random.choice(self.greetings)}"
+            return f"{time_greeting} {self._next_in_cycle(self._greeting_cycle)}"
     
-    def suggest_next_action(self, current_state: Dict) -> Dict[str, Any]:
+    def suggest_next_action(self, current_state: Dict) -> List[Dict[str, Any]]:
         """Suggest the next best action based on current recruiting state"""
-        suggestions = []
-        
         # Check what the recruiter has done so far
         has_uploaded = current_state.get('resumes_uploaded', 0) > 0
         has_searched = current_state.get('searches_performed', 0) > 0
         has_filtered = current_state.get('filters_applied', False)
         candidates_reviewed = current_state.get('candidates_reviewed', 0)
         
+        # Upload and search are mutually exclusive, so at most one priority-1
+        # suggestion applies and the first two matches are the top two
         if not has_uploaded:
-            suggestions.append({
-                'action': 'upload_resume',
-                'message': "Let's start by uploading some resumes! You can drag and drop multiple files at once.",
-                'button_text': 'Upload Resumes',
-                'link': '/',
-                'priority': 1
-            })
-        
-        if not has_searched and has_uploaded:
-            suggestions.append({
-                'action': 'search_candidates',
-                'message': "Now let's search your candidate database. What skills are you looking for?",
-                'button_text': 'Search Candidates',
-                'link': '/candidates',
-                'priority': 1
-            })
+            suggestions = [UPLOAD_SUGGESTION]
+        elif not has_searched:
+            suggestions = [SEARCH_SUGGESTION]
+        else:
+            suggestions = []
         
         if has_searched and not has_filtered:
-            suggestions.append({
-                'action': 'apply_filters',
-                'message': "Try narrowing down your search with filters like location, certifications, or experience level.",
-                'button_text': 'Refine Search',
-                'link': '/candidates',
-                'priority': 2
-            })
+            suggestions.append(FILTER_SUGGESTION)
         
-        if candidates_reviewed < 5 and has_uploaded:
+        if len(suggestions) < 2 and candidates_reviewed < 5 and has_uploaded:
             suggestions.append({
                 'action': 'review_more',
-                'message': f"You've reviewed {candidates_reviewed} candidates. Let's look at a few more to find the perfect match!",
+                'message': REVIEW_MORE_MESSAGE.format(count=candidates_reviewed),
                 'button_text': 'View More Candidates',
                 'link': '/candidates',
                 'priority': 3
             })
         
-        # Add a random tip
-        suggestions.append({
-            'action': 'tip',
-            'message': random.choice(self.tips),
-            'button_text': None,
-            'link': None,
-            'priority': 4
-        })
+        if len(suggestions) < 2:
+            suggestions.append({
+                'action': 'tip',
+                'message': self._next_in_cycle(self._tip_cycle),
+                'button_text': None,
+                'link': None,
+                'priority': 4
+            })
         
-        # Sort by priority and return top suggestions
-        suggestions.sort(key=lambda x: x['priority'])
-        return suggestions[:2]
+        return suggestions
     
     def analyze_search_intent(self, query: str) -> Dict[str, Any]:
         """Analyze what the recruiter is looking for and provide guidance"""
@@ -152,39 +385,27 @@ class RecruitmentAssistant:
             'suggestions': []
         }
         
-        # Detect trade type
-        trades = {
-            'electrician': ['electrical', 'electrician', 'journeyman electrician', 'master electrician'],
-            'hvac': ['hvac', 'heating', 'cooling', 'air conditioning', 'refrigeration'],
-            'plumber': ['plumber', 'plumbing', 'pipefitter', 'pipe'],
-            'carpenter': ['carpenter', 'carpentry', 'framing', 'finishing'],
-            'window': ['window', 'door', 'glazier', 'installation'],
-            'general': ['construction', 'laborer', 'general contractor']
-        }
+        # Find every trade and certification keyword in one scan
+        keywords = {match.group(1) for match in _INTENT_SCANNER.finditer(query_lower)}
+        trades = {_KEYWORD_TO_TRADE[keyword] for keyword in keywords if keyword in _KEYWORD_TO_TRADE}
+        certifications = {_KEYWORD_TO_CERT[keyword] for keyword in keywords if keyword in _KEYWORD_TO_CERT}
         
-        for trade, keywords in trades.items():
-            if any(keyword in query_lower for keyword in keywords):
+        # Detect trade type (table order decides between several matches)
+        for trade in TRADE_KEYWORDS:
+            if trade in trades:
                 intent['trade'] = trade
                 break
         
         # Detect certifications
-        certifications = {
-            'OSHA': ['osha', 'osha 10', 'osha 30', 'osha 40'],
-            'EPA': ['epa', 'epa certified', '608', '609'],
-            'State License': ['licensed', 'license', 'journeyman', 'master'],
-            'DOT': ['dot', 'cdl', 'commercial driver']
-        }
-        
-        for cert, keywords in certifications.items():
-            if any(keyword in query_lower for keyword in keywords):
-                intent['certifications'].append(cert)
+        intent['certifications'] = [cert for cert in CERTIFICATION_KEYWORDS if cert in certifications]
         
-        # Detect experience level
-        if any(word in query_lower for word in ['senior', 'experienced', 'veteran', '10+ years', '15+ years']):
+        # Detect experience level (one tokenization, hash lookups that stop at the first hit)
+        query_tokens = frozenset(_QUERY_TOKEN_RE.findall(query_lower))
+        if not SENIOR_WORDS.isdisjoint(query_tokens):
             intent['experience_level'] = 'senior'
-        elif any(word in query_lower for word in ['junior', 'entry', 'apprentice', 'helper']):
+        elif not JUNIOR_WORDS.isdisjoint(query_tokens):
             intent['experience_level'] = 'junior'
-        elif any(word in query_lower for word in ['mid-level', 'journeyman', '5+ years']):
+        elif not MID_WORDS.isdisjoint(query_tokens):
             intent['experience_level'] = 'mid'
         
         # Generate suggestions based on intent
@@ -195,12 +416,7 @@ class RecruitmentAssistant:
             intent['suggestions'].append(f"Looking for candidates with {', '.join(intent['certifications'])} - smart choice for compliance!")
         
         if intent['experience_level']:
-            level_text = {
-                'senior': 'seasoned professionals with 10+ years',
-                'mid': 'skilled journeymen with 5-10 years',
-                'junior': 'eager apprentices and helpers'
-            }
-            intent['suggestions'].append(f"Searching for {level_text.get(intent['experience_level'], 'experienced')} of experience.")
+            intent['suggestions'].append(f"Searching for {EXPERIENCE_LEVEL_TEXT.get(intent['experience_level'], 'experienced')} of experience.")
         
         if not intent['trade'] and not intent['certifications']:
             intent['suggestions'].append("Try being more specific - mention the trade, required certifications, or experience level you need.")
@@ -209,11 +425,127 @@ class RecruitmentAssistant:
     
     def generate_candidate_summary(self, candidate: Dict) -> str:
         """Generate a friendly, conversational summary of a candidate"""
-        if not self.client:
+        summary = self._known_summary(candidate)
+        if summary is not None:
+            return summary
+        
+        try:
+            response = self.client.chat.completions.create(**self._summary_request(candidate))
+            
+            summary = response.choices[0].message.content
+            self._remember_summary(candidate, summary)
+            return summary
+            
+        except Exception as e:
+            self.logger.error(f"Error generating AI summary: {e}")
             return self._generate_simple_summary(candidate)
+    
+    def generate_candidate_summaries(self, candidates: List[Dict]) -> List[str]:
+        """Summarize several candidates, sending the uncached ones to OpenAI in batches
+        
+        Returns one summary per candidate, in the same order as candidates.
+        """
+        summaries = [self._known_summary(candidate) for candidate in candidates]
+        pending = [index for index, summary in enumerate(summaries) if summary is None]
+        
+        for start in range(0, len(pending), SUMMARY_BATCH_SIZE):
+            batch = pending[start:start + SUMMARY_BATCH_SIZE]
+            try:
+                profiles = [
+                    {
+                        'id': position,
+                        'name': f"{candidates[index].get('first_name', '')} {candidates[index].get('last_name', '')}".strip(),
+                        'trade': candidates[index].get('job_title', 'Not specified'),
+                        'experience_years': candidates[index].get('experience_years', 'Unknown'),
+                        'skills': candidates[index].get('skills', [])[:5],
+                        'certifications': candidates[index].get('certifications', []),
+                        'location': candidates[index].get('location', 'Not specified')
+                    }
+                    for position, index in enumerate(batch)
+                ]
+                prompt = f"""Create a brief, conversational summary for each of these candidates that highlights
+            their key strengths and fit for trades work. Be encouraging and professional, and keep each summary
+            under 3 sentences.
+            
+            Respond with JSON in this format, one entry per candidate with the same id:
+            {{"summaries": [{{"id": 0, "summary": "..."}}]}}
+            
+            Candidates:
+            {_PROMPT_JSON.encode(profiles)}"""
+                
+                response = self.client.chat.completions.create(
+                    model=Config.SCOUT_MODEL,
+                    messages=[
+                        {"role": "system", "content": SCOUT_SYSTEM_PROMPT},
+                        {"role": "user", "content": prompt}
+                    ],
+                    response_format={"type": "json_object"},
+                    max_tokens=SUMMARY_MAX_TOKENS * len(batch),
+                    temperature=SUMMARY_TEMPERATURE
+                )
+                
+                for item in json.loads(response.choices[0].message.content).get('summaries', []):
+                    position = item.get('id')
+                    if isinstance(position, int) and 0 <= position < len(batch) and item.get('summary'):
+                        index = batch[position]
+                        summaries[index] = item['summary']
+                        self._remember_summary(candidates[index], item['summary'])
+                
+            except Exception as e:
+                self.logger.error(f"Error generating AI summaries batch: {e}")
+            
+            for index in batch:
+                if summaries[index] is None:
+                    summaries[index] = self._generate_simple_summary(candidates[index])
         
+        return summaries
+    
+    def stream_candidate_summary(self, candidate: Dict) -> Iterator[str]:
+        """Yield the candidate summary in pieces as the model generates it"""
+        summary = self._known_summary(candidate)
+        if summary is not None:
+            yield summary
+            return
+        
+        parts = []
         try:
-            prompt = f"""You are Scout, a friendly recruitment assistant. Create a brief, conversational summary of this candidate 
+            for delta in self._stream_completion(self._summary_request(candidate)):
+                parts.append(delta)
+                yield delta
+            self._remember_summary(candidate, ''.join(parts))
+            
+        except Exception as e:
+            self.logger.error(f"Error streaming AI summary: {e}")
+            if not parts:
+                yield self._generate_simple_summary(candidate)
+    
+    def _known_summary(self, candidate: Dict) -> Optional[str]:
+        """Return a summary that needs no OpenAI call, or None"""
+        # Summaries are produced alongside contact info by extract_candidate_info,
+        # so only candidates stored before that existed need a separate call
+        if candidate.get('scout_summary'):
+            return candidate['scout_summary']
+        
+        if not self.client:
+            return self._generate_simple_summary(candidate)
+        
+        cache_key = self._summary_cache_key(candidate)
+        cached = self._summary_cache.get(cache_key)
+        if cached is not None:
+            self._summary_cache.move_to_end(cache_key)
+        return cached
+    
+    def _remember_summary(self, candidate: Dict, summary: str):
+        """Store an AI summary in the LRU cache"""
+        if not summary:
+            return
+        self._summary_cache[self._summary_cache_key(candidate)] = summary
+        if len(self._summary_cache) > SUMMARY_CACHE_SIZE:
+            self._summary_cache.popitem(last=False)
+    
+    def _summary_request(self, candidate: Dict) -> Dict[str, Any]:
+        """Build the chat completion arguments for a candidate summary"""
+        prompt = f"""You are Scout, a friendly recruitment assistant. Create a brief, conversational summary of this candidate 
             that highlights their key strengths and fit for trades work. Be encouraging and professional.
             
             Candidate Info:
@@ -225,22 +557,37 @@ class RecruitmentAssistant:
             - Location: {candidate.get('location', 'Not specified')}
             
             Keep it under 3 sentences and highlight what makes them special."""
-            
-            response = self.client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": "You are Scout, a friendly and encouraging recruitment assistant."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=150,
-                temperature=0.7
-            )
-            
-            return response.choices[0].message.content
-            
-        except Exception as e:
-            self.logger.error(f"Error generating AI summary: {e}")
-            return self._generate_simple_summary(candidate)
+        
+        return {
+            'model': Config.SCOUT_MODEL,
+            'messages': [
+                {"role": "system", "content": SCOUT_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            'max_tokens': SUMMARY_MAX_TOKENS,
+            'stop': ["\n\n"],
+            'temperature': SUMMARY_TEMPERATURE
+        }
+    
+    def _stream_completion(self, request: Dict[str, Any]) -> Iterator[str]:
+        """Run a chat completion with stream=True and yield the text deltas"""
+        for chunk in self.client.chat.completions.create(stream=True, **request):
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    
+    def _summary_cache_key(self, candidate: Dict) -> str:
+        """Fingerprint the candidate fields that feed the summary prompt"""
+        canonical = {
+            'first_name': candidate.get('first_name', ''),
+            'last_name': candidate.get('last_name', ''),
+            'job_title': candidate.get('job_title', 'Not specified'),
+            'experience_years': candidate.get('experience_years', 'Unknown'),
+            'skills': sorted(candidate.get('skills', [])[:5]),
+            'certifications': sorted(candidate.get('certifications', [])),
+            'location': candidate.get('location', 'Not specified')
+        }
+        payload = _CACHE_KEY_JSON.encode(canonical)
+        return hashlib.sha256(payload.encode()).hexdigest()
     
     def _generate_simple_summary(self, candidate: Dict) -> str:
         """Fallback summary generation without AI"""
@@ -248,18 +595,11 @@ class RecruitmentAssistant:
         trade = candidate.get('job_title', 'trades professional')
         years = candidate.get('experience_years', 0)
         
-        if years > 10:
-            exp_text = f"veteran {trade} with {years}+ years"
-        elif years > 5:
-            exp_text = f"experienced {trade} with {years} years"
-        else:
-            exp_text = f"{trade} with {years} years"
+        template = EXPERIENCE_TEMPLATES[bisect.bisect_left(EXPERIENCE_BUCKETS, years)]
+        exp_text = template.format(trade=trade, years=years)
         
         certs = candidate.get('certifications', [])
-        if certs:
-            cert_text = f" and holds {', '.join(certs[:2])} certification"
-        else:
-            cert_text = ""
+        cert_text = f" and holds {', '.join(certs[:2])} certification" if certs else ""
         
         return f"{name} is an {exp_text} of experience{cert_text}. Worth considering for your team!"
     
@@ -278,10 +618,11 @@ class RecruitmentAssistant:
             tips.append("Start with the highest-rated candidates or those with the most relevant certifications.")
         
         # Add job-specific tips
-        if 'urgent' in job_requirements.lower() or 'asap' in job_requirements.lower():
+        requirements_lower = job_requirements.lower()
+        if 'urgent' in requirements_lower or 'asap' in requirements_lower:
             tips.append("For urgent hires, prioritize candidates who are immediately available.")
         
-        if 'license' in job_requirements.lower():
+        if 'license' in requirements_lower:
             tips.append("Don't forget to verify that licenses are current and valid in your state.")
         
         return tips
@@ -327,16 +668,7 @@ class RecruitmentAssistant:
     
     def detect_external_search_intent(self, message: str) -> bool:
         """Detect if user wants to search for candidates outside the database"""
-        external_keywords = [
-            'find candidates', 'search for', 'look for', 'find me',
-            'source', 'external', 'outside', 'new candidates',
-            'more candidates', 'additional candidates', 'other candidates',
-            'github', 'linkedin', 'online', 'web', 'internet',
-            'expand search', 'broader search', 'wider search'
-        ]
-        
-        message_lower = message.lower()
-        return any(keyword in message_lower for keyword in external_keywords)
+        return _EXTERNAL_SEARCH_RE.search(message.lower()) is not None
     
     def search_external_candidates(self, query: str, location: str = None) -> Dict[str, Any]:
         """Search for candidates using external APIs"""
@@ -344,16 +676,7 @@ class RecruitmentAssistant:
         intent = self.analyze_search_intent(query)
         
         # Extract job title from trade type
-        job_titles = {
-            'electrician': 'Electrician',
-            'hvac': 'HVAC Technician',
-            'plumber': 'Plumber',
-            'carpenter': 'Carpenter',
-            'window': 'Window Installer',
-            'general': 'Construction Worker'
-        }
-        
-        job_title = job_titles.get(intent['trade'], 'Trades Professional')
+        job_title = _JOB_TITLES.get(intent['trade'], 'Trades Professional')
         
         # Prepare skills list
         skills = []
@@ -362,12 +685,7 @@ class RecruitmentAssistant:
         skills.extend(intent.get('skills', []))
         
         # Determine experience years from level
-        experience_map = {
-            'senior': 10,
-            'mid': 5,
-            'junior': 1
-        }
-        experience_years = experience_map.get(intent['experience_level'], None)
+        experience_years = _EXPERIENCE_MAP.get(intent['experience_level'], None)
         
         # Use enhanced sourcing if available, otherwise fallback to basic sourcing
         try:
@@ -417,7 +735,7 @@ class RecruitmentAssistant:
         if not candidates:
             return "I couldn't find any candidates matching your criteria in external sources. Try adjusting your search terms or location."
         
-        response = f"🔍 I found {len(candidates)} potential candidates from external sources:\n\n"
+        parts = [f"🔍 I found {len(candidates)} potential candidates from external sources:\n\n"]
         
         for idx, candidate in enumerate(candidates[:10], 1):  # Show top 10 with enhanced sourcing
             source = candidate.get('source', 'Unknown')
@@ -430,106 +748,257 @@ class RecruitmentAssistant:
             fit_score = candidate.get('fit_score', 0)
             experience_years = candidate.get('experience_years', '')
             
-            response += f"**{idx}. {name}**"
-            if fit_score > 0:
-                response += f" (Match: {fit_score}%)"
-            response += f" - {source}\n"
-            
-            if title:
-                response += f"   Current Role: {title}"
-                if company:
-                    response += f" at {company}"
-                response += "\n"
-            
-            if experience_years:
-                response += f"   Experience: {experience_years} years\n"
+            match_line = f" (Match: {fit_score}%)" if fit_score > 0 else ""
+            company_text = f" at {company}" if company else ""
+            role_line = f"   Current Role: {title}{company_text}\n" if title else ""
+            experience_line = f"   Experience: {experience_years} years\n" if experience_years else ""
+            skills_line = f"   Skills: {skills}\n" if skills else ""
+            profile_line = f"   [View Profile]({profile_url})\n" if profile_url else ""
             
-            if skills:
-                response += f"   Skills: {skills}\n"
-            
-            response += f"   Location: {location}\n"
-            
-            if profile_url:
-                response += f"   [View Profile]({profile_url})\n"
-            response += "\n"
+            parts.append(
+                f"**{idx}. {name}**{match_line} - {source}\n"
+                f"{role_line}{experience_line}{skills_line}"
+                f"   Location: {location}\n"
+                f"{profile_line}\n"
+            )
         
         if len(candidates) > 10:
-            response += f"...and {len(candidates) - 10} more candidates.\n\n"
+            parts.append(f"...and {len(candidates) - 10} more candidates.\n\n")
         
-        response += "💡 **Tip:** These candidates were found using our enhanced AI-powered search across LinkedIn, Indeed, GitHub, and specialized trade boards.\n\n"
-        response += "Would you like me to add any of these candidates to your database for further review?"
+        parts.append("💡 **Tip:** These candidates were found using our enhanced AI-powered search across LinkedIn, Indeed, GitHub, and specialized trade boards.\n\n")
+        parts.append("Would you like me to add any of these candidates to your database for further review?")
         
-        return response
+        return "".join(parts)
     
     def get_conversation_response(self, user_message: str, context: Dict = None) -> Dict[str, Any]:
         """Generate a conversational response to user queries with external search capability"""
         
         # Check if user wants to search externally
-        if self.detect_external_search_intent(user_message):
-            # Extract location if mentioned
-            location = context.get('location', 'United States')
-            
-            # Perform external search
-            search_results = self.search_external_candidates(user_message, location)
-            
-            if search_results['success']:
-                formatted_response = self.format_external_candidates(search_results['candidates'])
-                return {
-                    'response': formatted_response,
-                    'external_search': True,
-                    'candidates_found': search_results['count'],
-                    'sources': search_results.get('sources_searched', [])
-                }
-            else:
-                return {
-                    'response': "I tried searching external sources but encountered an issue. Let me help you search our internal database instead.",
-                    'external_search': False,
-                    'error': search_results.get('error')
-                }
+        if self._should_search_externally(user_message, context):
+            # The prelude is generated while the search runs in the background
+            search_future = self._start_external_search(user_message, context)
+            prelude = ''.join(self._search_prelude(user_message))
+            result = self._external_search_result(search_future)
+            if prelude:
+                result['response'] = f"{prelude}\n\n{result['response']}"
+            return result
         
         # Regular conversation response
         if not self.client:
             return {
-                'response': "I'd love to help, but I need the OpenAI API key configured first. Please add it in your settings!",
+                'response': NO_CLIENT_RESPONSE,
                 'external_search': False
             }
         
         try:
-            system_prompt = """You are Scout, a friendly and helpful recruitment assistant for TradesCompass Pro. 
-            You help recruiters find skilled trades professionals (electricians, HVAC techs, plumbers, carpenters, etc.).
-            Be conversational, encouraging, and professional. Use occasional emojis for friendliness.
-            Keep responses concise and actionable. Focus on practical recruiting advice.
+            context_info = self._conversation_context(context)
             
-            If someone asks about finding or searching for candidates, mention that you can search both the internal database 
-            and external sources including LinkedIn, Indeed Resumes, GitHub, and specialized trade job boards through our 
-            enhanced AI-powered search capabilities."""
+            embedding = self._embed_text(user_message)
+            cached = self._lookup_semantic_cache(context_info, embedding)
+            if cached is not None:
+                return {
+                    'response': cached,
+                    'external_search': False
+                }
             
-            # Add context if available
-            context_info = ""
-            if context:
-                if context.get('current_search'):
-                    context_info += f"\nCurrent search: {context['current_search']}"
-                if context.get('candidates_found'):
-                    context_info += f"\nCandidates found: {context['candidates_found']}"
+            response = self.client.chat.completions.create(**self._conversation_request(user_message, context_info, self._pick_model(user_message)))
             
-            response = self.client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": f"{user_message}\n{context_info}"}
-                ],
-                max_tokens=200,
-                temperature=0.8
-            )
+            reply = response.choices[0].message.content
+            self._remember_semantic_reply(context_info, embedding, reply)
             
             return {
-                'response': response.choices[0].message.content,
+                'response': reply,
                 'external_search': False
             }
             
         except Exception as e:
             self.logger.error(f"Error generating conversation response: {e}")
             return {
-                'response': "I'm having a bit of trouble right now, but I'm still here to help! What can I assist you with?",
+                'response': TROUBLE_RESPONSE,
                 'external_search': False
-            }
\ No newline at end of file
+            }
+    
+    def stream_conversation_response(self, user_message: str, context: Dict = None) -> Iterator[Dict[str, Any]]:
+        """Stream a conversational response as it is generated
+        
+        Yields {'delta': text} events, then one final event with 'done': True
+        carrying the same metadata get_conversation_response returns.
+        """
+        if self._should_search_externally(user_message, context):
+            search_future = self._start_external_search(user_message, context)
+            separator = ''
+            for delta in self._search_prelude(user_message):
+                separator = '\n\n'
+                yield {'delta': delta}
+            result = self._external_search_result(search_future)
+            yield {'delta': separator + result.pop('response')}
+            yield dict(result, done=True)
+            return
+        
+        if not self.client:
+            yield {'delta': NO_CLIENT_RESPONSE}
+            yield {'done': True, 'external_search': False}
+            return
+        
+        # No semantic cache here: the embedding round trip would delay the first
+        # token, which is what streaming is for
+        parts = []
+        try:
+            context_info = self._conversation_context(context)
+            
+            for delta in self._stream_completion(self._conversation_request(user_message, context_info, self._pick_model(user_message))):
+                parts.append(delta)
+                yield {'delta': delta}
+            
+        except Exception as e:
+            self.logger.error(f"Error streaming conversation response: {e}")
+            if not parts:
+                yield {'delta': TROUBLE_RESPONSE}
+        
+        yield {'done': True, 'external_search': False}
+    
+    def _should_search_externally(self, user_message: str, context: Dict = None) -> bool:
+        """Decide whether a chat message should start an external search
+        
+        The recruiter can turn external searches off with
+        context['allow_external_search'] = False. Vague messages with a single
+        search phrase and no trade or certification are answered as normal
+        chat, and searches are rate limited per assistant.
+        """
+        if context and context.get('allow_external_search') is False:
+            return False
+        
+        message_lower = user_message.lower()
+        matches = len(_EXTERNAL_SEARCH_RE.findall(message_lower))
+        if matches == 0:
+            return False
+        if matches < EXTERNAL_SEARCH_MIN_MATCHES and not _INTENT_SCANNER.search(message_lower):
+            return False
+        
+        with self._external_search_lock:
+            now = time.monotonic()
+            recent = self._external_search_times
+            if len(recent) == recent.maxlen and now - recent[0] < EXTERNAL_SEARCH_RATE_WINDOW:
+                self.logger.info("External search rate limit reached, answering from chat instead")
+                return False
+            recent.append(now)
+        return True
+    
+    def _start_external_search(self, user_message: str, context: Dict = None) -> Future:
+        """Start an external candidate search in the background"""
+        # Extract location if mentioned
+        location = (context or {}).get('location', 'United States')
+        
+        return _SEARCH_EXECUTOR.submit(self.search_external_candidates, user_message, location)
+    
+    def _external_search_result(self, search_future: Future) -> Dict[str, Any]:
+        """Wait for an external search and format it as a chat response"""
+        search_results = search_future.result()
+        
+        if search_results['success']:
+            formatted_response = self.format_external_candidates(search_results['candidates'])
+            return {
+                'response': formatted_response,
+                'external_search': True,
+                'candidates_found': search_results['count'],
+                'sources': search_results.get('sources_searched', [])
+            }
+        else:
+            return {
+                'response': "I tried searching external sources but encountered an issue. Let me help you search our internal database instead.",
+                'external_search': False,
+                'error': search_results.get('error')
+            }
+    
+    def _search_prelude(self, user_message: str) -> Iterator[str]:
+        """Yield a one-line acknowledgement to show while an external search runs"""
+        if not self.client:
+            return
+        
+        try:
+            yield from self._stream_completion({
+                'model': Config.SCOUT_MODEL,
+                'messages': [
+                    {"role": "system", "content": SCOUT_SYSTEM_PROMPT},
+                    {"role": "user", "content": f"In one short sentence, let the recruiter know you're searching external sources for this request: {user_message}"}
+                ],
+                'max_tokens': 40,
+                'temperature': 0.7
+            })
+        except Exception as e:
+            self.logger.warning(f"Could not generate search prelude: {e}")
+    
+    def _conversation_context(self, context: Dict = None) -> str:
+        """Describe the recruiter's current page context for the model"""
+        # Add context if available
+        context_info = []
+        if context:
+            if context.get('current_search'):
+                context_info.append(f"Current search: {context['current_search']}")
+            if context.get('candidates_found'):
+                context_info.append(f"Candidates found: {context['candidates_found']}")
+        
+        return "\n".join(context_info)
+    
+    def _pick_model(self, user_message: str) -> str:
+        """Use the small model for short chat and escalate long or analytical requests"""
+        if len(user_message) >= COMPLEX_MESSAGE_LENGTH or COMPLEX_REQUEST_RE.search(user_message.lower()):
+            return Config.SCOUT_COMPLEX_MODEL
+        return Config.SCOUT_MODEL
+    
+    def _conversation_request(self, user_message: str, context_info: str, model: str) -> Dict[str, Any]:
+        """Build the chat completion arguments for a conversational reply"""
+        messages = [
+            {"role": "system", "content": SCOUT_CHAT_SYSTEM_PROMPT},
+            {"role": "user", "content": user_message}
+        ]
+        # Context goes after the message so the shared prefix stays cacheable
+        if context_info:
+            messages.append({"role": "user", "content": context_info})
+        
+        return {
+            'model': model,
+            'messages': messages,
+            'max_tokens': CHAT_MAX_TOKENS,
+            'stop': ["\n\n\n"],
+            'temperature': 0.8
+        }
+    
+    def _embed_text(self, text: str) -> Optional[array]:
+        """Return the L2-normalized embedding of text, or None if embedding fails"""
+        try:
+            response = self.client.embeddings.create(model=EMBEDDING_MODEL, input=text)
+            vector = response.data[0].embedding
+        except Exception as e:
+            self.logger.warning(f"Could not embed chat message for semantic cache: {e}")
+            return None
+        
+        norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+        return array('f', (value / norm for value in vector))
+    
+    def _lookup_semantic_cache(self, context_info: str, embedding: Optional[array]) -> Optional[str]:
+        """Return the cached reply for the same context whose message is most similar to embedding, if close enough"""
+        if embedding is None:
+            return None
+        
+        with self._semantic_cache_lock:
+            entries = list(self._semantic_cache)
+        
+        best_score, best_reply = 0.0, None
+        for cached_context, cached_embedding, reply in entries:
+            # Replies depend on the page context, so only an identical context can be reused
+            if cached_context != context_info:
+                continue
+            # Both vectors are normalized, so the dot product is the cosine similarity
+            score = sum(map(operator.mul, cached_embedding, embedding))
+            if score > best_score:
+                best_score, best_reply = score, reply
+        
+        return best_reply if best_score >= SEMANTIC_CACHE_THRESHOLD else None
+    
+    def _remember_semantic_reply(self, context_info: str, embedding: Optional[array], reply: str):
+        """Store a chat reply in the semantic cache"""
+        if embedding is None or not reply:
+            return
+        with self._semantic_cache_lock:
+            self._semantic_cache.append((context_info, embedding, reply))
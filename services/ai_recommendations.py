@@ -3,15 +3,178 @@ AI-Powered Candidate Recommendation Service for TalentCompass AI
 Uses OpenAI to provide intelligent candidate recommendations
 """
 
+import copy
+import hashlib
+import heapq
 import json
 import logging
-from typing import List, Dict, Any, Optional
+import math
+import operator
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Iterable, Iterator, Optional
 from openai import OpenAI
 import os
 from models import ResumeAnalysis, CandidateSkill, ScoringScheme
+from services.ai_analysis import truncate_to_tokens
 from sqlalchemy import and_, or_, func
 from app import db
 
+# Candidates scored per OpenAI request by _ai_rank_candidates_batch
+RANK_BATCH_SIZE = 20
+
+# Prompt budgets (estimated tokens) for free-text fields
+JOB_DESCRIPTION_MAX_TOKENS = 400
+CANDIDATE_TEXT_MAX_TOKENS = 150
+
+# Pools larger than limit are narrowed by embedding similarity to the job
+# description before any candidate is sent to the chat model
+EMBEDDING_MODEL = 'text-embedding-3-small'
+EMBEDDING_BATCH_SIZE = 100
+EMBEDDING_TEXT_CHARS = 8000
+
+# Pools with more ids than this are excluded in Python rather than with NOT IN
+EXCLUDE_IDS_SQL_MAX = 500
+
+# Ranking batches for large pools are sent to OpenAI concurrently
+_RANK_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix='rank-candidates')
+
+# Prompt templates and system messages are built once. Responses use
+# structured outputs (strict JSON schemas), so the prompts don't need to
+# spell out the JSON shape and replies always parse.
+_RANK_SYSTEM_MESSAGE = {"role": "system", "content": "You are an expert recruiter scoring candidates."}
+
+_RANK_PROMPT_TEMPLATE = """Score each candidate's fit for the job (0-100), with one ranking per candidate using the candidate's id.
+
+Job Description: {job_description}
+Required Skills: {required_skills}
+
+Candidates (rating is the current rating out of 10):
+{candidates}"""
+
+_STRING_LIST = {"type": "array", "items": {"type": "string"}}
+
+_RANKINGS_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "candidate_rankings",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "rankings": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "id": {"type": "integer"},
+                            "fit_score": {"type": "number"},
+                            "skill_match_score": {"type": "number"},
+                            "experience_match": {"type": "number"},
+                            "reasons_to_hire": _STRING_LIST,
+                            "concerns": _STRING_LIST,
+                            "missing_skills": _STRING_LIST
+                        },
+                        "required": [
+                            "id", "fit_score", "skill_match_score", "experience_match",
+                            "reasons_to_hire", "concerns", "missing_skills"
+                        ],
+                        "additionalProperties": False
+                    }
+                }
+            },
+            "required": ["rankings"],
+            "additionalProperties": False
+        }
+    }
+}
+
+_INSIGHTS_SYSTEM_MESSAGE = {"role": "system", "content": "You are an expert recruiter providing strategic candidate insights."}
+
+_INSIGHTS_PROMPT_TEMPLATE = """Analyze this candidate and provide strategic insights:
+
+Candidate Information:
+- Name: {first_name} {last_name}
+- Location: {location}
+- Strengths: {strengths}
+- Weaknesses: {weaknesses}
+- Overall Rating: {rating}/10
+{job_context}
+Include unique strengths, areas to probe, 3 targeted interview questions, what the
+candidate might want in negotiation, flight risk (low/medium/high with reason),
+growth potential, team fit and actionable next steps."""
+
+_INSIGHTS_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "candidate_insights",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "key_differentiators": _STRING_LIST,
+                "potential_concerns": _STRING_LIST,
+                "interview_questions": _STRING_LIST,
+                "negotiation_leverage": {"type": "string"},
+                "flight_risk": {"type": "string"},
+                "growth_potential": {"type": "string"},
+                "team_fit_analysis": {"type": "string"},
+                "recommended_next_steps": _STRING_LIST
+            },
+            "required": [
+                "key_differentiators", "potential_concerns", "interview_questions",
+                "negotiation_leverage", "flight_risk", "growth_potential",
+                "team_fit_analysis", "recommended_next_steps"
+            ],
+            "additionalProperties": False
+        }
+    }
+}
+
+# AI rankings and insights are cached per process for CACHE_TTL seconds.
+# Keys hash the exact candidate data and job text sent to the model, so an
+# edited candidate or job description simply misses the cache.
+CACHE_SIZE = 4096
+CACHE_TTL = 3600
+_RANKING_CACHE = OrderedDict()
+_INSIGHTS_CACHE = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+
+# JSON codecs built once; json.dumps/json.loads with options build new ones per call.
+# Prompt JSON is compact to keep batched ranking requests small.
+_CACHE_KEY_JSON = json.JSONEncoder(sort_keys=True, separators=(',', ':'), default=str)
+_PROMPT_JSON = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False, default=str)
+_decode_json = json.JSONDecoder().decode
+
+def _cache_key(*parts) -> str:
+    """Hash JSON-serializable parts into a cache key"""
+    payload = _CACHE_KEY_JSON.encode(parts)
+    return hashlib.blake2b(payload.encode(), digest_size=20).hexdigest()
+
+def _cache_get(cache: OrderedDict, key: str) -> Optional[Dict[str, Any]]:
+    """Return a copy of a fresh cached result, or None"""
+    with _CACHE_LOCK:
+        entry = cache.get(key)
+        if entry is None:
+            return None
+        stored_at, value = entry
+        if time.monotonic() - stored_at > CACHE_TTL:
+            del cache[key]
+            return None
+        cache.move_to_end(key)
+        return copy.deepcopy(value)
+
+def _cache_put(cache: OrderedDict, key: str, value: Dict[str, Any]):
+    """Store a copy of a result, evicting the least recently used entries"""
+    with _CACHE_LOCK:
+        cache[key] = (time.monotonic(), copy.deepcopy(value))
+        cache.move_to_end(key)
+        while len(cache) > CACHE_SIZE:
+            cache.popitem(last=False)
+
 class AIRecommendationService:
     """AI-powered candidate recommendation engine"""
     
@@ -38,7 +201,7 @@ class AIRecommendationService:
         """
         
         # Get initial candidate pool
-        candidates = self._get_candidate_pool(required_skills, location_preference)
+        candidates = self._get_candidate_pool(required_skills, location_preference, limit * 4)
         
         if not candidates:
             return []
@@ -46,21 +209,25 @@ class AIRecommendationService:
         # Get scoring scheme
         scoring_scheme = None
         if scoring_scheme_id:
-            scoring_scheme = ScoringScheme.query.get(scoring_scheme_id)
+            scoring_scheme = db.session.get(ScoringScheme, scoring_scheme_id)
+        
+        # Narrow large pools to the closest matches so only `limit`
+        # candidates are sent to the chat model
+        if len(candidates) > limit:
+            candidates = self._prefilter_by_embedding(candidates, job_description, limit)
         
         # Rank candidates using AI
-        ranked_candidates = []
-        for candidate in candidates[:limit * 2]:  # Process more to filter later
-            ranking = self._ai_rank_candidate(
-                candidate, job_description, required_skills, scoring_scheme
-            )
-            if ranking:
-                ranked_candidates.append(ranking)
+        rankings = self._ai_rank_candidates_batch(
+            candidates, job_description, required_skills, scoring_scheme
+        )
+        ranked_candidates = [ranking for ranking in rankings if ranking]
         
-        # Sort by AI score
-        ranked_candidates.sort(key=lambda x: x['ai_score'], reverse=True)
+        # Top candidates by AI score; only these are serialized
+        top_candidates = heapq.nlargest(limit, ranked_candidates, key=lambda x: x['ai_score'])
+        for ranking in top_candidates:
+            ranking['candidate'] = ranking['candidate'].to_dict()
         
-        return ranked_candidates[:limit]
+        return top_candidates
     
     def find_similar_candidates(
         self,
@@ -74,50 +241,52 @@ class AIRecommendationService:
             candidate_id: ID of reference candidate
             limit: Maximum similar candidates to return
         """
-        reference = ResumeAnalysis.query.get(candidate_id)
+        reference = db.session.get(ResumeAnalysis, candidate_id)
         if not reference:
             return []
         
         # Extract key attributes
-        reference_skills = [skill.skill_name for skill in reference.skills]
+        reference_skills = self._skills_by_candidate([candidate_id])[candidate_id]
         reference_text = reference.resume_text or ''
         
         # Find candidates with similar skills
-        similar_candidates = []
-        
-        if reference_skills:
-            # Query candidates with overlapping skills
-            skill_matches = db.session.query(
-                ResumeAnalysis,
-                func.count(CandidateSkill.id).label('matching_skills')
-            ).join(
-                CandidateSkill
-            ).filter(
-                and_(
-                    CandidateSkill.skill_name.in_(reference_skills),
-                    ResumeAnalysis.id != candidate_id
-                )
-            ).group_by(
-                ResumeAnalysis.id
-            ).order_by(
-                func.count(CandidateSkill.id).desc()
-            ).limit(limit * 2).all()
-            
-            for candidate, match_count in skill_matches:
-                similarity_score = self._calculate_similarity(
-                    reference, candidate, reference_skills
-                )
-                similar_candidates.append({
-                    'candidate': candidate,
-                    'similarity_score': similarity_score,
-                    'matching_skills': match_count,
-                    'comparison': self._generate_comparison(reference, candidate)
-                })
+        if not reference_skills:
+            return []
         
-        # Sort by similarity score
-        similar_candidates.sort(key=lambda x: x['similarity_score'], reverse=True)
+        # Query candidates with overlapping skills, streamed in chunks
+        skill_matches = db.session.query(
+            ResumeAnalysis,
+            func.count(CandidateSkill.id).label('matching_skills')
+        ).join(
+            CandidateSkill
+        ).filter(
+            and_(
+                CandidateSkill.skill_name.in_(reference_skills),
+                ResumeAnalysis.id != candidate_id
+            )
+        ).group_by(
+            ResumeAnalysis.id
+        ).order_by(
+            func.count(CandidateSkill.id).desc()
+        ).limit(limit * 2).yield_per(50)
+        
+        # Keep a running top-K of the most similar candidates; comparisons
+        # are only built for the ones returned
+        top_matches = heapq.nlargest(
+            limit,
+            self._calculate_similarities(reference, skill_matches, reference_skills),
+            key=operator.itemgetter(2)
+        )
         
-        return similar_candidates[:limit]
+        return [
+            {
+                'candidate': candidate,
+                'similarity_score': similarity_score,
+                'matching_skills': match_count,
+                'comparison': self._generate_comparison(reference, candidate)
+            }
+            for candidate, match_count, similarity_score in top_matches
+        ]
     
     def generate_candidate_insights(
         self,
@@ -131,50 +300,47 @@ class AIRecommendationService:
             candidate_id: Candidate to analyze
             job_context: Optional job context for targeted insights
         """
-        candidate = ResumeAnalysis.query.get(candidate_id)
+        candidate = db.session.get(ResumeAnalysis, candidate_id)
         if not candidate:
             return {}
         
         try:
-            prompt = f"""
-            Analyze this candidate and provide strategic insights:
-            
-            Candidate Information:
-            - Name: {candidate.first_name} {candidate.last_name}
-            - Location: {candidate.location}
-            - Strengths: {candidate.candidate_strengths}
-            - Weaknesses: {candidate.candidate_weaknesses}
-            - Overall Rating: {candidate.overall_fit_rating}/10
-            
-            {"Job Context: " + job_context if job_context else ""}
+            # The id is part of the key since it is stored in the result, and duplicate
+            # records can share the same profile text
+            cache_key = _cache_key(
+                candidate_id, candidate.first_name, candidate.last_name, candidate.location,
+                candidate.candidate_strengths, candidate.candidate_weaknesses,
+                candidate.overall_fit_rating, job_context
+            )
+            insights = _cache_get(_INSIGHTS_CACHE, cache_key)
+            if insights is not None:
+                return insights
             
-            Provide insights in JSON format:
-            {{
-                "key_differentiators": ["list of unique strengths"],
-                "potential_concerns": ["list of areas to probe"],
-                "interview_questions": ["3 targeted questions"],
-                "negotiation_leverage": "what candidate might want",
-                "flight_risk": "low/medium/high with reason",
-                "growth_potential": "assessment of future potential",
-                "team_fit_analysis": "how they might fit in team",
-                "recommended_next_steps": ["actionable recommendations"]
-            }}
-            """
+            prompt = _INSIGHTS_PROMPT_TEMPLATE.format(
+                first_name=candidate.first_name,
+                last_name=candidate.last_name,
+                location=candidate.location,
+                strengths=truncate_to_tokens(candidate.candidate_strengths, CANDIDATE_TEXT_MAX_TOKENS),
+                weaknesses=truncate_to_tokens(candidate.candidate_weaknesses, CANDIDATE_TEXT_MAX_TOKENS),
+                rating=candidate.overall_fit_rating,
+                job_context=f"\nJob Context: {job_context}\n" if job_context else ""
+            )
             
             response = self.client.chat.completions.create(
                 model="gpt-4o-mini",
                 messages=[
-                    {"role": "system", "content": "You are an expert recruiter providing strategic candidate insights."},
+                    _INSIGHTS_SYSTEM_MESSAGE,
                     {"role": "user", "content": prompt}
                 ],
-                response_format={"type": "json_object"},
+                response_format=_INSIGHTS_RESPONSE_FORMAT,
                 temperature=0.7
             )
             
-            insights = json.loads(response.choices[0].message.content)
+            insights = _decode_json(response.choices[0].message.content)
             insights['candidate_id'] = candidate_id
             insights['candidate_name'] = f"{candidate.first_name} {candidate.last_name}"
             
+            _cache_put(_INSIGHTS_CACHE, cache_key, insights)
             return insights
             
         except Exception as e:
@@ -198,13 +364,9 @@ class AIRecommendationService:
             current_pool: Current candidate IDs in pool
             target_size: Target pool size
         """
-        # Get current pool candidates
-        current_candidates = ResumeAnalysis.query.filter(
-            ResumeAnalysis.id.in_(current_pool)
-        ).all() if current_pool else []
-        
-        # Analyze current pool
-        pool_analysis = self._analyze_pool_diversity(current_candidates)
+        # Analyze current pool (only ids that still exist are counted)
+        pool_analysis = self._analyze_pool_diversity(current_pool or [])
+        pool_size = pool_analysis.get('pool_size', 0)
         
         # Find candidates to add for better diversity/quality
         recommendations = {
@@ -216,20 +378,20 @@ class AIRecommendationService:
         }
         
         # Find high-quality candidates not in pool
-        if len(current_candidates) < target_size:
+        if pool_size < target_size:
             additional_candidates = self._find_complementary_candidates(
                 job_requirements,
                 current_pool,
-                target_size - len(current_candidates)
+                target_size - pool_size
             )
             recommendations['recommended_additions'] = additional_candidates
         
         # Identify weak candidates to potentially remove
-        if len(current_candidates) > target_size:
+        if pool_size > target_size:
             weak_candidates = self._identify_weak_candidates(
-                current_candidates,
+                current_pool,
                 job_requirements,
-                len(current_candidates) - target_size
+                pool_size - target_size
             )
             recommendations['recommended_removals'] = weak_candidates
         
@@ -238,28 +400,35 @@ class AIRecommendationService:
     def _get_candidate_pool(
         self,
         required_skills: List[str] = None,
-        location: str = None
+        location: str = None,
+        limit: int = None
     ) -> List[ResumeAnalysis]:
-        """Get initial candidate pool based on filters"""
+        """Get initial candidate pool based on filters, best rated first"""
         query = ResumeAnalysis.query.filter(
             ResumeAnalysis.status == 'active'
         )
         
         if required_skills:
-            # Filter by skills
+            # Filter by skills: candidates must have at least half of them
+            skill_names = set(required_skills)
+            min_matches = (len(skill_names) + 1) // 2
             query = query.join(CandidateSkill).filter(
-                CandidateSkill.skill_name.in_(required_skills)
+                CandidateSkill.skill_name.in_(skill_names)
             ).group_by(
                 ResumeAnalysis.id
             ).having(
-                func.count(CandidateSkill.id) >= len(required_skills) * 0.5
+                func.count(func.distinct(CandidateSkill.skill_name)) >= min_matches
             )
         
         if location:
             query = query.filter(
-                func.lower(ResumeAnalysis.location).contains(location.lower())
+                ResumeAnalysis.location.ilike(f"%{location}%")
             )
         
+        query = query.order_by(ResumeAnalysis.overall_fit_rating.desc().nulls_last())
+        if limit:
+            query = query.limit(limit)
+        
         return query.all()
     
     def _ai_rank_candidate(
@@ -270,44 +439,84 @@ class AIRecommendationService:
         scoring_scheme: Optional[ScoringScheme]
     ) -> Dict[str, Any]:
         """Use AI to rank a candidate for a specific job"""
-        try:
-            # Prepare candidate summary
-            candidate_skills = [skill.skill_name for skill in candidate.skills]
-            
-            prompt = f"""
-            Score this candidate's fit for the job (0-100):
-            
-            Job Description: {job_description[:1000]}
-            Required Skills: {', '.join(required_skills) if required_skills else 'Not specified'}
-            
-            Candidate:
-            - Skills: {', '.join(candidate_skills)}
-            - Location: {candidate.location}
-            - Strengths: {candidate.candidate_strengths}
-            - Current Rating: {candidate.overall_fit_rating}/10
-            
-            Provide a JSON response with:
-            {{
-                "fit_score": 0-100,
-                "skill_match_score": 0-100,
-                "experience_match": 0-100,
-                "reasons_to_hire": ["list of reasons"],
-                "concerns": ["list of concerns"],
-                "missing_skills": ["skills they lack"]
-            }}
-            """
-            
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "You are an expert recruiter scoring candidates."},
-                    {"role": "user", "content": prompt}
-                ],
-                response_format={"type": "json_object"},
-                temperature=0.3
-            )
+        ranking = self._ai_rank_candidates_batch(
+            [candidate], job_description, required_skills, scoring_scheme
+        )[0]
+        if ranking:
+            ranking['candidate'] = candidate.to_dict()
+        return ranking
+    
+    def _ai_rank_candidates_batch(
+        self,
+        candidates: List[ResumeAnalysis],
+        job_description: str,
+        required_skills: List[str],
+        scoring_scheme: Optional[ScoringScheme]
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Use AI to rank candidates for a specific job, RANK_BATCH_SIZE per request
+        
+        Cached analyses are reused and requests for different batches run
+        concurrently. Returns one ranking per candidate in input order, or
+        None for candidates that could not be scored. Rankings hold the
+        ResumeAnalysis itself under 'candidate' so callers only serialize
+        the candidates they keep.
+        """
+        # Candidate data is read here, on the request thread, so the worker
+        # threads only talk to OpenAI and never touch the database session
+        skills_by_candidate = self._skills_by_candidate([candidate.id for candidate in candidates])
+        all_skills = [skills_by_candidate[candidate.id] for candidate in candidates]
+        profiles = [
+            {
+                'id': candidate.id,
+                'skills': candidate_skills,
+                'location': candidate.location,
+                'strengths': truncate_to_tokens(candidate.candidate_strengths, CANDIDATE_TEXT_MAX_TOKENS),
+                'rating': candidate.overall_fit_rating
+            }
+            for candidate, candidate_skills in zip(candidates, all_skills)
+        ]
+        
+        # Job-level values are computed once for the whole batch
+        job_description = truncate_to_tokens(job_description, JOB_DESCRIPTION_MAX_TOKENS)
+        required_set = frozenset(required_skills or ())
+        job_key_parts = (job_description, sorted(required_set))
+        
+        # The scoring scheme is applied after the model call, so it is not part of the key
+        cache_keys = [_cache_key(profile, *job_key_parts) for profile in profiles]
+        analyses = [_cache_get(_RANKING_CACHE, key) for key in cache_keys]
+        
+        uncached = [index for index, ai_analysis in enumerate(analyses) if ai_analysis is None]
+        batches = []
+        for start in range(0, len(uncached), RANK_BATCH_SIZE):
+            indexes = uncached[start:start + RANK_BATCH_SIZE]
+            prompt = self._ranking_prompt([profiles[index] for index in indexes], job_description, required_skills)
+            batches.append((indexes, prompt))
+        
+        if len(batches) > 1:
+            futures = [_RANK_EXECUTOR.submit(self._request_rankings, prompt) for _, prompt in batches]
+        else:
+            futures = [None] * len(batches)
+        
+        for (indexes, prompt), future in zip(batches, futures):
+            try:
+                batch_analyses = future.result() if future else self._request_rankings(prompt)
+            except Exception as e:
+                logging.error(f"Error ranking candidates {[candidates[index].id for index in indexes]}: {str(e)}")
+                continue
             
-            ai_analysis = json.loads(response.choices[0].message.content)
+            for index in indexes:
+                ai_analysis = batch_analyses.get(str(candidates[index].id))
+                if ai_analysis and 'fit_score' in ai_analysis:
+                    analyses[index] = ai_analysis
+                    _cache_put(_RANKING_CACHE, cache_keys[index], ai_analysis)
+        
+        rankings = []
+        for candidate, candidate_skills, ai_analysis in zip(candidates, all_skills, analyses):
+            if ai_analysis is None:
+                logging.error(f"Error ranking candidate {candidate.id}: no AI analysis")
+                rankings.append(None)
+                continue
             
             # Apply custom scoring scheme if provided
             final_score = ai_analysis['fit_score']
@@ -316,51 +525,171 @@ class AIRecommendationService:
                     ai_analysis, scoring_scheme
                 )
             
-            return {
-                'candidate': candidate.to_dict(),
+            rankings.append({
+                'candidate': candidate,
                 'ai_score': final_score,
                 'ai_analysis': ai_analysis,
-                'matching_skills': [s for s in candidate_skills if s in required_skills] if required_skills else []
-            }
-            
+                'matching_skills': [s for s in candidate_skills if s in required_set]
+            })
+        
+        return rankings
+    
+    def _ranking_prompt(
+        self,
+        profiles: List[Dict[str, Any]],
+        job_description: str,
+        required_skills: List[str]
+    ) -> str:
+        """Build the scoring prompt for one batch of candidate profiles (job description already truncated)"""
+        return _RANK_PROMPT_TEMPLATE.format(
+            job_description=job_description,
+            required_skills=', '.join(required_skills) if required_skills else 'Not specified',
+            candidates=_PROMPT_JSON.encode(profiles)
+        )
+    
+    def _request_rankings(self, prompt: str) -> Dict[str, Dict[str, Any]]:
+        """Send one scoring prompt and return the AI analyses keyed by candidate id"""
+        response = self.client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[
+                _RANK_SYSTEM_MESSAGE,
+                {"role": "user", "content": prompt}
+            ],
+            response_format=_RANKINGS_RESPONSE_FORMAT,
+            temperature=0.3
+        )
+        
+        analyses = {}
+        for ai_analysis in _decode_json(response.choices[0].message.content).get('rankings', []):
+            analyses[str(ai_analysis.pop('id', None))] = ai_analysis
+        return analyses
+    
+    def _prefilter_by_embedding(
+        self,
+        candidates: List[ResumeAnalysis],
+        job_description: str,
+        keep: int
+    ) -> List[ResumeAnalysis]:
+        """Keep the candidates whose embeddings are most similar to the job description"""
+        try:
+            self._ensure_candidate_embeddings(candidates)
+            job_vector = self._embed_texts([job_description[:EMBEDDING_TEXT_CHARS]])[0]
         except Exception as e:
-            logging.error(f"Error ranking candidate {candidate.id}: {str(e)}")
-            return None
+            logging.error(f"Error embedding candidates for prefilter: {str(e)}")
+            return candidates[:keep]
+        
+        scored = []
+        for candidate in candidates:
+            vector = array('f')
+            vector.frombytes(candidate.candidate_embedding)
+            # Both vectors are unit length, so the dot product is the cosine similarity
+            scored.append((sum(map(operator.mul, vector, job_vector)), candidate))
+        
+        return [candidate for _, candidate in heapq.nlargest(keep, scored, key=operator.itemgetter(0))]
     
-    def _calculate_similarity(
+    def _ensure_candidate_embeddings(self, candidates: List[ResumeAnalysis]):
+        """Embed candidates with no embedding, or whose profile changed since it was embedded
+        
+        New values are flushed, not committed; they're saved if the request's
+        transaction is committed.
+        """
+        skills_by_candidate = self._skills_by_candidate([candidate.id for candidate in candidates])
+        
+        missing = []
+        for candidate in candidates:
+            text = self._embedding_text(candidate, skills_by_candidate[candidate.id])
+            text_hash = hashlib.blake2b(text.encode(), digest_size=20).hexdigest()
+            if not candidate.candidate_embedding or candidate.candidate_embedding_hash != text_hash:
+                missing.append((candidate, text, text_hash))
+        if not missing:
+            return
+        
+        for start in range(0, len(missing), EMBEDDING_BATCH_SIZE):
+            batch = missing[start:start + EMBEDDING_BATCH_SIZE]
+            vectors = self._embed_texts([text for _, text, _ in batch])
+            for (candidate, _, text_hash), vector in zip(batch, vectors):
+                candidate.candidate_embedding = vector.tobytes()
+                candidate.candidate_embedding_hash = text_hash
+        
+        db.session.flush()
+    
+    def _embedding_text(self, candidate: ResumeAnalysis, candidate_skills: List[str]) -> str:
+        """Text that represents a candidate for embedding similarity"""
+        text = f"Skills: {', '.join(candidate_skills)}\nStrengths: {candidate.candidate_strengths or ''}\n{candidate.resume_text or ''}"
+        return text[:EMBEDDING_TEXT_CHARS]
+    
+    def _embed_texts(self, texts: List[str]) -> List[array]:
+        """Embed texts in one request and return L2-normalized float32 vectors"""
+        response = self.client.embeddings.create(model=EMBEDDING_MODEL, input=texts)
+        
+        vectors = []
+        for item in sorted(response.data, key=lambda item: item.index):
+            vector = array('f', item.embedding)
+            norm = math.sqrt(sum(map(operator.mul, vector, vector))) or 1.0
+            vectors.append(array('f', (value / norm for value in vector)))
+        return vectors
+    
+    def _skills_by_candidate(self, candidate_ids: List[int]) -> Dict[int, List[str]]:
+        """Load the skill names of many candidates with a single query
+        
+        ResumeAnalysis.skills is a dynamic relationship, so it can't be eager
+        loaded and reading it per candidate costs one query each.
+        """
+        skills_by_candidate = {candidate_id: [] for candidate_id in candidate_ids}
+        if candidate_ids:
+            rows = db.session.query(
+                CandidateSkill.candidate_id, CandidateSkill.skill_name
+            ).filter(
+                CandidateSkill.candidate_id.in_(candidate_ids)
+            ).order_by(CandidateSkill.id)
+            for candidate_id, skill_name in rows:
+                skills_by_candidate[candidate_id].append(skill_name)
+        return skills_by_candidate
+    
+    def _calculate_similarities(
         self,
         reference: ResumeAnalysis,
-        candidate: ResumeAnalysis,
+        skill_matches: Iterable[tuple],
         reference_skills: List[str]
-    ) -> float:
-        """Calculate similarity between two candidates"""
-        score = 0.0
-        
-        # Skill overlap
-        candidate_skills = [skill.skill_name for skill in candidate.skills]
-        skill_overlap = len(set(reference_skills) & set(candidate_skills))
-        if reference_skills:
-            score += (skill_overlap / len(reference_skills)) * 40
-        
-        # Rating similarity
-        if reference.overall_fit_rating and candidate.overall_fit_rating:
-            rating_diff = abs(reference.overall_fit_rating - candidate.overall_fit_rating)
-            score += max(0, 30 - rating_diff * 3)
-        
-        # Location match
-        if reference.location and candidate.location:
-            if reference.location.lower() == candidate.location.lower():
-                score += 15
-            elif any(loc in candidate.location.lower() 
-                    for loc in reference.location.lower().split()):
-                score += 10
-        
-        # Risk/reward similarity
-        if reference.risk_factor_score and candidate.risk_factor_score:
-            risk_diff = abs(reference.risk_factor_score - candidate.risk_factor_score)
-            score += max(0, 15 - risk_diff * 1.5)
-        
-        return min(100, score)
+    ) -> Iterator[tuple]:
+        """
+        Calculate the similarity of each candidate to the reference candidate
+        
+        skill_matches yields (candidate, skill_overlap) pairs, where
+        skill_overlap is the number of reference skills the candidate has as
+        counted by the skill match query. Yields (candidate, skill_overlap,
+        similarity_score) as the matches are consumed. Everything derived
+        from the reference is computed once.
+        """
+        skill_weight = 40 / len(reference_skills) if reference_skills else 0.0
+        reference_rating = reference.overall_fit_rating
+        reference_risk = reference.risk_factor_score
+        reference_location = reference.location.lower() if reference.location else None
+        reference_location_words = reference_location.split() if reference_location else []
+        
+        for candidate, skill_overlap in skill_matches:
+            # Skill overlap
+            score = skill_overlap * skill_weight
+            
+            # Rating similarity
+            if reference_rating and candidate.overall_fit_rating:
+                rating_diff = abs(reference_rating - candidate.overall_fit_rating)
+                score += max(0, 30 - rating_diff * 3)
+            
+            # Location match
+            if reference_location and candidate.location:
+                candidate_location = candidate.location.lower()
+                if reference_location == candidate_location:
+                    score += 15
+                elif any(loc in candidate_location for loc in reference_location_words):
+                    score += 10
+            
+            # Risk/reward similarity
+            if reference_risk and candidate.risk_factor_score:
+                risk_diff = abs(reference_risk - candidate.risk_factor_score)
+                score += max(0, 15 - risk_diff * 1.5)
+            
+            yield candidate, skill_overlap, min(100, score)
     
     def _generate_comparison(
         self,
@@ -383,25 +712,35 @@ class AIRecommendationService:
     
     def _analyze_pool_diversity(
         self,
-        candidates: List[ResumeAnalysis]
+        candidate_ids: List[int]
     ) -> Dict[str, Any]:
-        """Analyze diversity and quality of candidate pool"""
-        if not candidates:
+        """Analyze diversity and quality of candidate pool with aggregate queries"""
+        if not candidate_ids:
             return {'diversity_score': 0, 'quality_score': 0}
         
-        # Analyze locations
-        locations = [c.location for c in candidates if c.location]
-        location_diversity = len(set(locations)) / len(candidates) if locations else 0
+        # Locations and ratings; blank locations and zero ratings count as missing
+        pool_size, location_count, avg_rating = db.session.query(
+            func.count(ResumeAnalysis.id),
+            func.count(func.distinct(func.nullif(ResumeAnalysis.location, ''))),
+            func.avg(func.nullif(ResumeAnalysis.overall_fit_rating, 0))
+        ).filter(
+            ResumeAnalysis.id.in_(candidate_ids)
+        ).one()
         
-        # Analyze skills
-        all_skills = []
-        for candidate in candidates:
-            all_skills.extend([s.skill_name for s in candidate.skills])
-        skill_diversity = len(set(all_skills)) / len(all_skills) if all_skills else 0
+        if not pool_size:
+            return {'diversity_score': 0, 'quality_score': 0}
+        
+        location_diversity = location_count / pool_size
+        avg_rating = float(avg_rating or 0)
         
-        # Analyze ratings
-        ratings = [c.overall_fit_rating for c in candidates if c.overall_fit_rating]
-        avg_rating = sum(ratings) / len(ratings) if ratings else 0
+        # Skills
+        distinct_skills, total_skills = db.session.query(
+            func.count(func.distinct(CandidateSkill.skill_name)),
+            func.count(CandidateSkill.id)
+        ).filter(
+            CandidateSkill.candidate_id.in_(candidate_ids)
+        ).one()
+        skill_diversity = distinct_skills / total_skills if total_skills else 0
         
         return {
             'diversity_score': (location_diversity + skill_diversity) * 50,
@@ -409,7 +748,7 @@ class AIRecommendationService:
             'location_diversity': location_diversity,
             'skill_diversity': skill_diversity,
             'average_rating': avg_rating,
-            'pool_size': len(candidates)
+            'pool_size': pool_size
         }
     
     def _find_complementary_candidates(
@@ -419,17 +758,27 @@ class AIRecommendationService:
         limit: int
     ) -> List[Dict[str, Any]]:
         """Find candidates that complement the existing pool"""
-        # Get candidates not in current pool
+        # Best-rated active candidates first (served by ix_candidate_status_rating)
         query = ResumeAnalysis.query.filter(
-            and_(
-                ResumeAnalysis.status == 'active',
-                ~ResumeAnalysis.id.in_(exclude_ids) if exclude_ids else True
-            )
+            ResumeAnalysis.status == 'active'
         ).order_by(
             ResumeAnalysis.overall_fit_rating.desc()
-        ).limit(limit)
+        )
         
-        candidates = query.all()
+        if len(exclude_ids or ()) <= EXCLUDE_IDS_SQL_MAX:
+            candidates = query.filter(
+                ~ResumeAnalysis.id.in_(exclude_ids) if exclude_ids else True
+            ).limit(limit).all()
+        else:
+            # A huge NOT IN list is slow to send and plan; walk the index
+            # order instead and skip pool members until enough are found
+            excluded = set(exclude_ids)
+            candidates = []
+            for candidate in query.yield_per(max(limit * 2, 50)):
+                if candidate.id not in excluded:
+                    candidates.append(candidate)
+                    if len(candidates) >= limit:
+                        break
         
         return [
             {
@@ -443,18 +792,18 @@ class AIRecommendationService:
     
     def _identify_weak_candidates(
         self,
-        candidates: List[ResumeAnalysis],
+        pool_ids: List[int],
         job_requirements: Dict[str, Any],
         count: int
     ) -> List[Dict[str, Any]]:
         """Identify weakest candidates in pool"""
-        # Sort by rating
-        sorted_candidates = sorted(
-            candidates,
-            key=lambda c: c.overall_fit_rating or 0
-        )
-        
-        weak_candidates = sorted_candidates[:count]
+        # Lowest rated candidates; unrated ones count as 0
+        weak_candidates = ResumeAnalysis.query.filter(
+            ResumeAnalysis.id.in_(pool_ids)
+        ).order_by(
+            func.coalesce(ResumeAnalysis.overall_fit_rating, 0).asc(),
+            ResumeAnalysis.id
+        ).limit(count).all()
         
         return [
             {
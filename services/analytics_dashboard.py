@@ -4,50 +4,90 @@ Provides comprehensive recruitment metrics and insights
 """
 
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List
-from sqlalchemy import func, and_, or_
+from flask import current_app
+from sqlalchemy import func, and_, or_, case, event
 from models import (
     ResumeAnalysis, CandidateReferral, RecruiterTask, 
     CommunicationLog, CandidateAssessment, TalentPool,
     CandidateSkill, db
 )
+import copy
+import functools
 import json
+import threading
+import time
+
+# Dashboard aggregates scan whole tables but change slowly, so each metric is
+# cached per process for METRICS_CACHE_TTL seconds. Writes to any model the
+# metrics read from clear the cache so new data shows up on the next request.
+METRICS_CACHE_TTL = 120
+_METRICS_CACHE = {}
+_METRICS_CACHE_LOCK = threading.Lock()
+
+_REPORT_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix='dashboard-metrics')
+
+def _cached_metrics(method):
+    """Memoize a zero-argument metrics method for METRICS_CACHE_TTL seconds"""
+    @functools.wraps(method)
+    def wrapper(self):
+        with _METRICS_CACHE_LOCK:
+            entry = _METRICS_CACHE.get(method.__name__)
+        if entry is not None and time.monotonic() - entry[0] <= METRICS_CACHE_TTL:
+            return copy.deepcopy(entry[1])
+        
+        value = method(self)
+        with _METRICS_CACHE_LOCK:
+            _METRICS_CACHE[method.__name__] = (time.monotonic(), value)
+        return copy.deepcopy(value)
+    return wrapper
+
+def invalidate_metrics_cache(*args):
+    """Drop all cached dashboard metrics"""
+    with _METRICS_CACHE_LOCK:
+        _METRICS_CACHE.clear()
+
+for _model in (ResumeAnalysis, CandidateSkill, RecruiterTask, CandidateReferral):
+    for _event_name in ('after_insert', 'after_update', 'after_delete'):
+        event.listen(_model, _event_name, invalidate_metrics_cache)
 
 class AnalyticsDashboardService:
     """Generate analytics and metrics for recruitment dashboard"""
     
+    @_cached_metrics
     def get_overview_metrics(self) -> Dict[str, Any]:
         """Get high-level overview metrics"""
-        # Total candidates
-        total_candidates = ResumeAnalysis.query.count()
-        active_candidates = ResumeAnalysis.query.filter_by(status='active').count()
-        
-        # Recent activity (last 30 days)
+        # Each table is summarized in one round-trip using conditional aggregation
         thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-        new_candidates = ResumeAnalysis.query.filter(
-            ResumeAnalysis.upload_date >= thirty_days_ago
-        ).count()
-        
-        # Average ratings
-        avg_rating = db.session.query(
+        total_candidates, active_candidates, new_candidates, avg_rating = db.session.query(
+            func.count(ResumeAnalysis.id),
+            func.sum(case((ResumeAnalysis.status == 'active', 1), else_=0)),
+            func.sum(case((ResumeAnalysis.upload_date >= thirty_days_ago, 1), else_=0)),
             func.avg(ResumeAnalysis.overall_fit_rating)
-        ).filter(
-            ResumeAnalysis.overall_fit_rating.isnot(None)
-        ).scalar() or 0
+        ).one()
+        active_candidates = active_candidates or 0
+        new_candidates = new_candidates or 0
+        avg_rating = avg_rating or 0
         
         # Task metrics
-        total_tasks = RecruiterTask.query.count()
-        completed_tasks = RecruiterTask.query.filter_by(status='completed').count()
-        overdue_tasks = RecruiterTask.query.filter(
-            and_(
+        total_tasks, completed_tasks, overdue_tasks = db.session.query(
+            func.count(RecruiterTask.id),
+            func.sum(case((RecruiterTask.status == 'completed', 1), else_=0)),
+            func.sum(case((and_(
                 RecruiterTask.status != 'completed',
                 RecruiterTask.due_date < datetime.utcnow()
-            )
-        ).count()
+            ), 1), else_=0))
+        ).one()
+        completed_tasks = completed_tasks or 0
+        overdue_tasks = overdue_tasks or 0
         
         # Referral metrics
-        total_referrals = CandidateReferral.query.count()
-        hired_referrals = CandidateReferral.query.filter_by(referral_status='hired').count()
+        total_referrals, hired_referrals = db.session.query(
+            func.count(CandidateReferral.id),
+            func.sum(case((CandidateReferral.referral_status == 'hired', 1), else_=0))
+        ).one()
+        hired_referrals = hired_referrals or 0
         
         return {
             'total_candidates': total_candidates,
@@ -62,6 +102,7 @@ class AnalyticsDashboardService:
             'referral_success_rate': (hired_referrals / total_referrals * 100) if total_referrals > 0 else 0
         }
     
+    @_cached_metrics
     def get_candidate_pipeline_metrics(self) -> Dict[str, Any]:
         """Get metrics for candidate pipeline stages"""
         pipeline_stages = db.session.query(
@@ -84,26 +125,21 @@ class AnalyticsDashboardService:
             }
         }
     
+    @_cached_metrics
     def get_source_effectiveness(self) -> Dict[str, Any]:
         """Analyze effectiveness of different candidate sources"""
         sources = db.session.query(
             ResumeAnalysis.source,
             func.count(ResumeAnalysis.id).label('count'),
-            func.avg(ResumeAnalysis.overall_fit_rating).label('avg_rating')
+            func.avg(ResumeAnalysis.overall_fit_rating).label('avg_rating'),
+            func.sum(case((ResumeAnalysis.status == 'hired', 1), else_=0)).label('hired')
         ).group_by(
             ResumeAnalysis.source
         ).all()
         
         source_metrics = []
-        for source, count, avg_rating in sources:
-            # Get hired count for this source
-            hired_count = ResumeAnalysis.query.filter(
-                and_(
-                    ResumeAnalysis.source == source,
-                    ResumeAnalysis.status == 'hired'
-                )
-            ).count()
-            
+        for source, count, avg_rating, hired_count in sources:
+            hired_count = hired_count or 0
             source_metrics.append({
                 'source': source or 'Unknown',
                 'total_candidates': count,
@@ -123,46 +159,56 @@ class AnalyticsDashboardService:
             'best_source': source_metrics[0] if source_metrics else None
         }
     
+    @_cached_metrics
     def get_skill_demand_analysis(self) -> Dict[str, Any]:
         """Analyze most in-demand skills"""
-        # Get skill frequency
+        # Skill frequency and the average rating of candidates holding each skill
         skills = db.session.query(
             CandidateSkill.skill_name,
-            func.count(CandidateSkill.id).label('count')
+            func.count(CandidateSkill.id).label('count'),
+            func.avg(ResumeAnalysis.overall_fit_rating).label('avg_rating')
+        ).join(
+            ResumeAnalysis, ResumeAnalysis.id == CandidateSkill.candidate_id
         ).group_by(
             CandidateSkill.skill_name
         ).order_by(
             func.count(CandidateSkill.id).desc()
         ).limit(20).all()
         
-        skill_metrics = []
-        for skill_name, count in skills:
-            # Get average rating for candidates with this skill
-            avg_rating = db.session.query(
-                func.avg(ResumeAnalysis.overall_fit_rating)
-            ).join(
-                CandidateSkill
-            ).filter(
-                CandidateSkill.skill_name == skill_name
-            ).scalar() or 0
-            
-            skill_metrics.append({
+        skill_metrics = [
+            {
                 'skill': skill_name,
                 'candidate_count': count,
-                'average_rating': round(avg_rating, 2)
-            })
+                'average_rating': round(avg_rating or 0, 2)
+            }
+            for skill_name, count, avg_rating in skills
+        ]
         
         return {
             'top_skills': skill_metrics[:10],
             'skill_distribution': skill_metrics
         }
     
+    @_cached_metrics
     def get_time_to_fill_metrics(self) -> Dict[str, Any]:
         """Calculate time-to-fill metrics"""
-        # Get candidates who were hired
-        hired_candidates = ResumeAnalysis.query.filter_by(status='hired').all()
+        # Only the upload dates are needed, so skip hydrating full candidate rows.
+        # Newest uploads first gives the day counts in ascending order straight
+        # from the (status, upload_date) index, so no sort is needed here.
+        now = datetime.utcnow()
+        time_to_fill_days = [
+            # Days from upload to hire; in production, you'd track actual hire date
+            (now - upload_date).days
+            for upload_date, in db.session.query(
+                ResumeAnalysis.upload_date
+            ).filter(
+                ResumeAnalysis.status == 'hired'
+            ).order_by(
+                ResumeAnalysis.upload_date.desc()
+            )
+        ]
         
-        if not hired_candidates:
+        if not time_to_fill_days:
             return {
                 'average_time_to_fill': 0,
                 'median_time_to_fill': 0,
@@ -170,23 +216,15 @@ class AnalyticsDashboardService:
                 'slowest_hire': 0
             }
         
-        time_to_fill_days = []
-        for candidate in hired_candidates:
-            # Calculate days from upload to hire
-            # In production, you'd track actual hire date
-            days = (datetime.utcnow() - candidate.upload_date).days
-            time_to_fill_days.append(days)
-        
-        time_to_fill_days.sort()
-        
         return {
             'average_time_to_fill': sum(time_to_fill_days) / len(time_to_fill_days),
             'median_time_to_fill': time_to_fill_days[len(time_to_fill_days) // 2],
-            'fastest_hire': min(time_to_fill_days),
-            'slowest_hire': max(time_to_fill_days),
-            'sample_size': len(hired_candidates)
+            'fastest_hire': time_to_fill_days[0],
+            'slowest_hire': time_to_fill_days[-1],
+            'sample_size': len(time_to_fill_days)
         }
     
+    @_cached_metrics
     def get_diversity_metrics(self) -> Dict[str, Any]:
         """Calculate diversity metrics for candidate pool"""
         # Location diversity
@@ -202,20 +240,27 @@ class AnalyticsDashboardService:
         unique_locations = len(locations)
         total_with_location = sum(count for _, count in locations)
         
-        # Skill diversity
-        unique_skills = db.session.query(
+        # Rating distribution, with the skill diversity count riding along as a
+        # scalar subquery so both come back in one round-trip
+        unique_skills_subquery = db.session.query(
             func.count(func.distinct(CandidateSkill.skill_name))
-        ).scalar() or 0
-        
-        # Rating distribution
-        rating_distribution = db.session.query(
+        ).scalar_subquery()
+        rating_rows = db.session.query(
             func.floor(ResumeAnalysis.overall_fit_rating).label('rating_band'),
-            func.count(ResumeAnalysis.id).label('count')
+            func.count(ResumeAnalysis.id).label('count'),
+            unique_skills_subquery.label('unique_skills')
         ).filter(
             ResumeAnalysis.overall_fit_rating.isnot(None)
         ).group_by(
             func.floor(ResumeAnalysis.overall_fit_rating)
         ).all()
+        rating_distribution = [(band, count) for band, count, _ in rating_rows]
+        
+        # Skill diversity (queried on its own only when no candidate has a rating)
+        if rating_rows:
+            unique_skills = rating_rows[0].unique_skills or 0
+        else:
+            unique_skills = db.session.query(unique_skills_subquery).scalar() or 0
         
         return {
             'location_diversity': {
@@ -232,6 +277,7 @@ class AnalyticsDashboardService:
             }
         }
     
+    @_cached_metrics
     def get_recruiter_performance(self) -> Dict[str, Any]:
         """Analyze recruiter performance metrics"""
         # Task completion by recruiter
@@ -262,6 +308,7 @@ class AnalyticsDashboardService:
             'top_performer': recruiter_metrics[0] if recruiter_metrics else None
         }
     
+    @_cached_metrics
     def get_referral_analytics(self) -> Dict[str, Any]:
         """Analyze referral program effectiveness"""
         # Referral sources
@@ -309,12 +356,22 @@ class AnalyticsDashboardService:
     
     def generate_weekly_report(self) -> Dict[str, Any]:
         """Generate comprehensive weekly report"""
+        # The dashboard aggregates are independent and wait on the database, so they
+        # run concurrently, each worker in its own app context (and so its own session)
+        app = current_app._get_current_object()
+        overview = _REPORT_EXECUTOR.submit(_run_in_app_context, app, self.get_overview_metrics)
+        sources = _REPORT_EXECUTOR.submit(_run_in_app_context, app, self.get_source_effectiveness)
+        skills = _REPORT_EXECUTOR.submit(_run_in_app_context, app, self.get_skill_demand_analysis)
+        
         one_week_ago = datetime.utcnow() - timedelta(days=7)
         
-        # New candidates this week
-        new_candidates = ResumeAnalysis.query.filter(
+        # New and high-rated candidates added this week
+        new_candidates, high_rated = db.session.query(
+            func.count(ResumeAnalysis.id),
+            func.sum(case((ResumeAnalysis.overall_fit_rating >= 8.0, 1), else_=0))
+        ).filter(
             ResumeAnalysis.upload_date >= one_week_ago
-        ).count()
+        ).one()
         
         # Tasks completed this week
         tasks_completed = RecruiterTask.query.filter(
@@ -324,20 +381,17 @@ class AnalyticsDashboardService:
             )
         ).count()
         
-        # High-rated candidates added
-        high_rated = ResumeAnalysis.query.filter(
-            and_(
-                ResumeAnalysis.upload_date >= one_week_ago,
-                ResumeAnalysis.overall_fit_rating >= 8.0
-            )
-        ).count()
-        
         return {
             'week_ending': datetime.utcnow().strftime('%Y-%m-%d'),
             'new_candidates': new_candidates,
             'tasks_completed': tasks_completed,
-            'high_rated_candidates': high_rated,
-            'overview_metrics': self.get_overview_metrics(),
-            'source_effectiveness': self.get_source_effectiveness(),
-            'top_skills': self.get_skill_demand_analysis()['top_skills'][:5]
-        }
\ No newline at end of file
+            'high_rated_candidates': high_rated or 0,
+            'overview_metrics': overview.result(),
+            'source_effectiveness': sources.result(),
+            'top_skills': skills.result()['top_skills'][:5]
+        }
+
+def _run_in_app_context(app, method):
+    """Call a metrics method from a worker thread with its own app context"""
+    with app.app_context():
+        return method()
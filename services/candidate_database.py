@@ -1,10 +1,42 @@
+import functools
+import heapq
 import json
 import logging
+import threading
+import time
+from collections import defaultdict
+from operator import itemgetter
 from typing import List, Dict, Any, Optional
-from sqlalchemy import and_, or_, func
+from datetime import datetime, timedelta
+from sqlalchemy import and_, or_, func, event, inspect, tuple_, case
 from app import db
 from models import ResumeAnalysis, CandidateSkill, CandidateTag
 
+# Characters of resume text shown in search results
+SNIPPET_LENGTH = 200
+
+# Common tech skills to look for
+TECH_SKILLS = (
+    'Python', 'Java', 'JavaScript', 'React', 'Angular', 'Vue', 'Node.js',
+    'AWS', 'Azure', 'GCP', 'Docker', 'Kubernetes', 'SQL', 'PostgreSQL',
+    'MongoDB', 'Redis', 'Git', 'Linux', 'HTML', 'CSS', 'TypeScript',
+    'Machine Learning', 'AI', 'Data Science', 'TensorFlow', 'PyTorch',
+    'Pandas', 'NumPy', 'Scikit-learn', 'Django', 'Flask', 'Spring Boot',
+    'REST API', 'GraphQL', 'Microservices', 'Agile', 'Scrum', 'DevOps',
+    'CI/CD', 'Jenkins', 'Terraform', 'Ansible', 'Elasticsearch'
+)
+
+# Skill mention counts scan every resume, so they are cached per process and
+# recounted only after resume text changes or COMMON_SKILLS_CACHE_TTL passes
+COMMON_SKILLS_CACHE_TTL = 600
+_common_skills_cache = {}
+_common_skills_lock = threading.Lock()
+
+# Strengths/weaknesses are stored as JSON text; parsed lists and strength words
+# are memoized by that text, so repeated searches and similarity lookups skip
+# json.loads and tokenizing for unchanged candidates
+PARSED_JSON_CACHE_SIZE = 10000
+
 def search_candidates(
     skills: List[str] = None,
     min_fit_rating: float = None,
@@ -15,7 +47,8 @@ def search_candidates(
     sort_by: str = 'date_desc',
     experience_keywords: List[str] = None,
     page: int = 1,
-    per_page: int = 20
+    per_page: int = 20,
+    cursor: str = None
 ) -> Dict[str, Any]:
     """
     Advanced candidate search with multiple filters
@@ -31,12 +64,25 @@ def search_candidates(
         experience_keywords: Keywords to search in resume text
         page: Page number for pagination
         per_page: Results per page
+        cursor: next_cursor from a previous date-sorted page; when given, the page
+            after it is fetched by keyset instead of page number (no total count)
     
     Returns:
         Dictionary with candidates and pagination info
     """
     
-    query = ResumeAnalysis.query
+    # Plain rows with only the columns the response uses (no ORM instances); resume_text
+    # can be large, so just enough of it is fetched to build the snippet (one extra
+    # character shows truncation)
+    query = ResumeAnalysis.query.with_entities(
+        ResumeAnalysis.id, ResumeAnalysis.first_name, ResumeAnalysis.last_name,
+        ResumeAnalysis.email, ResumeAnalysis.phone, ResumeAnalysis.location,
+        ResumeAnalysis.filename, ResumeAnalysis.upload_date, ResumeAnalysis.overall_fit_rating,
+        ResumeAnalysis.risk_factor_score, ResumeAnalysis.reward_factor_score,
+        ResumeAnalysis.candidate_strengths, ResumeAnalysis.candidate_weaknesses,
+        ResumeAnalysis.status, ResumeAnalysis.source,
+        func.substr(ResumeAnalysis.resume_text, 1, SNIPPET_LENGTH + 1).label('resume_head')
+    )
     
     # Filter by fit rating
     if min_fit_rating is not None:
@@ -50,12 +96,20 @@ def search_candidates(
     if min_reward_score is not None:
         query = query.filter(ResumeAnalysis.reward_factor_score >= min_reward_score)
     
-    # Search by skills in resume text (basic implementation)
+    # Search by skills: candidates with structured skills match on CandidateSkill
+    # (case-insensitive equality), the rest fall back to their resume text
     if skills:
-        skill_conditions = []
-        for skill in skills:
-            skill_conditions.append(ResumeAnalysis.resume_text.ilike(f'%{skill}%'))
-        query = query.filter(or_(*skill_conditions))
+        skill_candidates = db.session.query(
+            CandidateSkill.candidate_id
+        ).filter(
+            func.lower(CandidateSkill.skill_name).in_({skill.lower() for skill in skills})
+        )
+        candidates_with_skills = db.session.query(CandidateSkill.candidate_id)
+        text_conditions = [ResumeAnalysis.resume_text.ilike(f'%{skill}%') for skill in skills]
+        query = query.filter(or_(
+            ResumeAnalysis.id.in_(skill_candidates),
+            and_(ResumeAnalysis.id.notin_(candidates_with_skills), or_(*text_conditions))
+        ))
     
     # Search by experience keywords
     if experience_keywords:
@@ -72,9 +126,19 @@ def search_candidates(
     if status and status in ['active', 'contacted', 'archived']:
         query = query.filter(ResumeAnalysis.status == status)
     
-    # Apply sorting based on sort_by parameter
+    # Keyset pagination for date sorts: seek past the (upload_date, id) of the last
+    # row on the previous page instead of using OFFSET, so deep pages stay cheap
+    keyset_sort = sort_by not in ('fit_desc', 'risk_asc')
+    seek_after = _parse_cursor(cursor) if cursor and keyset_sort else None
+    if seek_after:
+        if sort_by == 'date_asc':
+            query = query.filter(tuple_(ResumeAnalysis.upload_date, ResumeAnalysis.id) > seek_after)
+        else:
+            query = query.filter(tuple_(ResumeAnalysis.upload_date, ResumeAnalysis.id) < seek_after)
+    
+    # Apply sorting based on sort_by parameter (id breaks date ties for stable cursors)
     if sort_by == 'date_asc':
-        query = query.order_by(ResumeAnalysis.upload_date.asc())
+        query = query.order_by(ResumeAnalysis.upload_date.asc(), ResumeAnalysis.id.asc())
     elif sort_by == 'fit_desc':
         query = query.order_by(
             ResumeAnalysis.overall_fit_rating.desc().nulls_last(),
@@ -86,26 +150,68 @@ def search_candidates(
             ResumeAnalysis.upload_date.desc()
         )
     else:  # date_desc (default)
-        query = query.order_by(ResumeAnalysis.upload_date.desc())
+        query = query.order_by(ResumeAnalysis.upload_date.desc(), ResumeAnalysis.id.desc())
     
     # Paginate results
-    pagination = query.paginate(
-        page=page,
-        per_page=per_page,
-        error_out=False
+    if seek_after:
+        # One extra row tells whether another page follows; no COUNT query
+        items = query.limit(per_page + 1).all()
+        has_next = len(items) > per_page
+        items = items[:per_page]
+        page_info = {
+            'total': None,
+            'pages': None,
+            'current_page': None,
+            'per_page': per_page,
+            'has_prev': True,
+            'has_next': has_next,
+            'prev_num': None,
+            'next_num': None
+        }
+    else:
+        pagination = query.paginate(
+            page=page,
+            per_page=per_page,
+            error_out=False
+        )
+        items = pagination.items
+        page_info = {
+            'total': pagination.total,
+            'pages': pagination.pages,
+            'current_page': pagination.page,
+            'per_page': pagination.per_page,
+            'has_prev': pagination.has_prev,
+            'has_next': pagination.has_next,
+            'prev_num': pagination.prev_num,
+            'next_num': pagination.next_num
+        }
+    
+    last = items[-1] if items else None
+    page_info['next_cursor'] = (
+        f"{last.upload_date.isoformat()}_{last.id}"
+        if keyset_sort and page_info['has_next'] and last.upload_date else None
     )
     
+    # Load skills and tags for the whole page in two queries
+    candidate_ids = [analysis.id for analysis in items]
+    skills_by_candidate = defaultdict(list)
+    tags_by_candidate = defaultdict(list)
+    if candidate_ids:
+        for s in CandidateSkill.query.filter(
+            CandidateSkill.candidate_id.in_(candidate_ids)
+        ).order_by(CandidateSkill.skill_name):
+            skills_by_candidate[s.candidate_id].append(
+                {'skill': s.skill_name, 'proficiency': s.skill_level, 'years': s.years_experience}
+            )
+        for t in CandidateTag.query.filter(
+            CandidateTag.candidate_id.in_(candidate_ids)
+        ).order_by(CandidateTag.tag_name):
+            tags_by_candidate[t.candidate_id].append({'tag': t.tag_name, 'color': t.tag_color})
+    
     # Process candidates for response
     candidates = []
-    for analysis in pagination.items:
-        # Get skills for this candidate - using correct field names
-        skills = CandidateSkill.query.filter_by(candidate_id=analysis.id).all()
-        skill_data = [{'skill': s.skill_name, 'proficiency': s.skill_level, 'years': s.years_experience} for s in skills]
-        
-        # Get tags for this candidate - using correct field names
-        tags = CandidateTag.query.filter_by(candidate_id=analysis.id).all()
-        tag_data = [{'tag': t.tag_name, 'color': t.tag_color} for t in tags]
-        
+    for analysis in items:
+        resume_head = analysis.resume_head
         candidate_data = {
             'id': analysis.id,
             'name': f"{analysis.first_name or 'Unknown'} {analysis.last_name or ''}".strip(),
@@ -117,51 +223,53 @@ def search_candidates(
             'overall_fit_rating': analysis.overall_fit_rating,
             'risk_factor_score': analysis.risk_factor_score,
             'reward_factor_score': analysis.reward_factor_score,
-            'strengths': json.loads(analysis.candidate_strengths) if analysis.candidate_strengths else [],
-            'weaknesses': json.loads(analysis.candidate_weaknesses) if analysis.candidate_weaknesses else [],
-            'resume_snippet': analysis.resume_text[:200] + '...' if analysis.resume_text and len(analysis.resume_text) > 200 else analysis.resume_text,
+            'strengths': _json_list(analysis.candidate_strengths) if analysis.candidate_strengths else [],
+            'weaknesses': _json_list(analysis.candidate_weaknesses) if analysis.candidate_weaknesses else [],
+            'resume_snippet': resume_head[:SNIPPET_LENGTH] + '...' if resume_head and len(resume_head) > SNIPPET_LENGTH else resume_head,
             'status': analysis.status or 'active',
             'source': analysis.source or 'manual_upload',
-            'skills': skill_data,
-            'tags': tag_data
+            'skills': skills_by_candidate[analysis.id],
+            'tags': tags_by_candidate[analysis.id]
         }
         candidates.append(candidate_data)
     
-    return {
-        'candidates': candidates,
-        'total': pagination.total,
-        'pages': pagination.pages,
-        'current_page': pagination.page,
-        'per_page': pagination.per_page,
-        'has_prev': pagination.has_prev,
-        'has_next': pagination.has_next,
-        'prev_num': pagination.prev_num,
-        'next_num': pagination.next_num
-    }
+    return {'candidates': candidates, **page_info}
+
+def _parse_cursor(cursor: str):
+    """Split a '<upload_date ISO>_<id>' search cursor; None if it is malformed"""
+    try:
+        upload_date, candidate_id = cursor.rsplit('_', 1)
+        return datetime.fromisoformat(upload_date), int(candidate_id)
+    except (ValueError, AttributeError):
+        logging.warning(f"Ignoring invalid search cursor: {cursor!r}")
+        return None
 
 def get_candidate_statistics() -> Dict[str, Any]:
     """Get overview statistics of the candidate database"""
     
-    total_candidates = ResumeAnalysis.query.count()
-    
-    # Fit rating distribution
-    high_fit = ResumeAnalysis.query.filter(ResumeAnalysis.overall_fit_rating >= 8.0).count()
-    medium_fit = ResumeAnalysis.query.filter(
-        and_(ResumeAnalysis.overall_fit_rating >= 6.0, ResumeAnalysis.overall_fit_rating < 8.0)
-    ).count()
-    low_fit = ResumeAnalysis.query.filter(ResumeAnalysis.overall_fit_rating < 6.0).count()
-    
-    # Risk distribution
-    low_risk = ResumeAnalysis.query.filter(ResumeAnalysis.risk_factor_score <= 3.0).count()
-    medium_risk = ResumeAnalysis.query.filter(
-        and_(ResumeAnalysis.risk_factor_score > 3.0, ResumeAnalysis.risk_factor_score <= 6.0)
-    ).count()
-    high_risk = ResumeAnalysis.query.filter(ResumeAnalysis.risk_factor_score > 6.0).count()
-    
-    # Recent uploads (last 30 days)
-    from datetime import datetime, timedelta
+    # All counters come from one pass over the table using conditional aggregation
     recent_date = datetime.utcnow() - timedelta(days=30)
-    recent_uploads = ResumeAnalysis.query.filter(ResumeAnalysis.upload_date >= recent_date).count()
+    
+    def count_where(condition):
+        return func.sum(case((condition, 1), else_=0))
+    
+    fit = ResumeAnalysis.overall_fit_rating
+    risk = ResumeAnalysis.risk_factor_score
+    counts = db.session.query(
+        func.count(ResumeAnalysis.id),
+        # Fit rating distribution
+        count_where(fit >= 8.0),
+        count_where(and_(fit >= 6.0, fit < 8.0)),
+        count_where(fit < 6.0),
+        # Risk distribution
+        count_where(risk <= 3.0),
+        count_where(and_(risk > 3.0, risk <= 6.0)),
+        count_where(risk > 6.0),
+        # Recent uploads (last 30 days)
+        count_where(ResumeAnalysis.upload_date >= recent_date)
+    ).one()
+    (total_candidates, high_fit, medium_fit, low_fit,
+     low_risk, medium_risk, high_risk, recent_uploads) = [count or 0 for count in counts]
     
     # Top skills mentioned (basic implementation)
     common_skills = extract_common_skills()
@@ -188,33 +296,49 @@ def extract_common_skills(limit: int = 20) -> List[Dict[str, Any]]:
     This is a basic implementation - could be enhanced with NLP
     """
     
-    # Common tech skills to look for
-    tech_skills = [
-        'Python', 'Java', 'JavaScript', 'React', 'Angular', 'Vue', 'Node.js',
-        'AWS', 'Azure', 'GCP', 'Docker', 'Kubernetes', 'SQL', 'PostgreSQL',
-        'MongoDB', 'Redis', 'Git', 'Linux', 'HTML', 'CSS', 'TypeScript',
-        'Machine Learning', 'AI', 'Data Science', 'TensorFlow', 'PyTorch',
-        'Pandas', 'NumPy', 'Scikit-learn', 'Django', 'Flask', 'Spring Boot',
-        'REST API', 'GraphQL', 'Microservices', 'Agile', 'Scrum', 'DevOps',
-        'CI/CD', 'Jenkins', 'Terraform', 'Ansible', 'Elasticsearch'
-    ]
+    with _common_skills_lock:
+        cached = _common_skills_cache.get('sorted_skills')
+    if cached is not None and time.monotonic() - cached[0] <= COMMON_SKILLS_CACHE_TTL:
+        sorted_skills = cached[1]
+    else:
+        sorted_skills = _count_common_skills()
+        with _common_skills_lock:
+            _common_skills_cache['sorted_skills'] = (time.monotonic(), sorted_skills)
     
+    return [{'skill': skill, 'count': count} for skill, count in sorted_skills[:limit]]
+
+def _count_common_skills() -> List[tuple]:
+    """Scan all resume texts and return (skill, resume count) pairs, most common first"""
     skill_counts = {}
-    
-    # Get all resume texts
-    resumes = ResumeAnalysis.query.with_entities(ResumeAnalysis.resume_text).all()
-    
-    for resume in resumes:
-        if resume.resume_text:
-            text = resume.resume_text.lower()
-            for skill in tech_skills:
-                if skill.lower() in text:
+    skill_patterns = [(skill, skill.lower()) for skill in TECH_SKILLS]
+    
+    # Stream resume texts rather than loading the whole corpus at once
+    resumes = db.session.query(ResumeAnalysis.resume_text).filter(
+        ResumeAnalysis.resume_text.isnot(None)
+    ).yield_per(500)
+    
+    for resume_text, in resumes:
+        if resume_text:
+            text = resume_text.lower()
+            for skill, pattern in skill_patterns:
+                if pattern in text:
                     skill_counts[skill] = skill_counts.get(skill, 0) + 1
     
-    # Sort by count and return top skills
-    sorted_skills = sorted(skill_counts.items(), key=lambda x: x[1], reverse=True)
-    
-    return [{'skill': skill, 'count': count} for skill, count in sorted_skills[:limit]]
+    # Sort by count
+    return sorted(skill_counts.items(), key=lambda x: x[1], reverse=True)
+
+def _invalidate_common_skills(mapper, connection, target):
+    """Drop cached skill counts when a resume is added, removed or its text changes"""
+    with _common_skills_lock:
+        _common_skills_cache.clear()
+
+def _invalidate_common_skills_on_update(mapper, connection, target):
+    if inspect(target).attrs.resume_text.history.has_changes():
+        _invalidate_common_skills(mapper, connection, target)
+
+event.listen(ResumeAnalysis, 'after_insert', _invalidate_common_skills)
+event.listen(ResumeAnalysis, 'after_delete', _invalidate_common_skills)
+event.listen(ResumeAnalysis, 'after_update', _invalidate_common_skills_on_update)
 
 def get_similar_candidates(candidate_id: int, limit: int = 5) -> List[Dict[str, Any]]:
     """
@@ -222,7 +346,10 @@ def get_similar_candidates(candidate_id: int, limit: int = 5) -> List[Dict[str,
     """
     
     # Get the reference candidate
-    reference = ResumeAnalysis.query.get(candidate_id)
+    reference = db.session.query(
+        ResumeAnalysis.overall_fit_rating,
+        ResumeAnalysis.candidate_strengths
+    ).filter(ResumeAnalysis.id == candidate_id).first()
     if not reference:
         return []
     
@@ -236,53 +363,87 @@ def get_similar_candidates(candidate_id: int, limit: int = 5) -> List[Dict[str,
                 reference_skills.extend(strength.lower().split())
         except:
             pass
+    reference_skills = set(reference_skills)
+    
+    # Stream just the scoring columns and keep the top matches; contact details
+    # are loaded afterwards for those candidates only
+    rows = db.session.query(
+        ResumeAnalysis.id,
+        ResumeAnalysis.overall_fit_rating,
+        ResumeAnalysis.candidate_strengths
+    ).filter(
+        ResumeAnalysis.id != candidate_id,
+        ResumeAnalysis.candidate_strengths.isnot(None)
+    ).order_by(ResumeAnalysis.id).yield_per(500)
+    
+    top_matches = heapq.nlargest(
+        limit,
+        _score_similar_candidates(rows, reference_skills, reference.overall_fit_rating),
+        key=itemgetter(2)
+    )
+    if not top_matches:
+        return []
     
-    # Find candidates with similar skills (basic implementation)
-    similar_candidates = []
-    candidates = ResumeAnalysis.query.filter(ResumeAnalysis.id != candidate_id).all()
-    
-    for candidate in candidates:
-        if candidate.candidate_strengths:
-            try:
-                strengths = json.loads(candidate.candidate_strengths)
-                candidate_skills = []
-                for strength in strengths:
-                    candidate_skills.extend(strength.lower().split())
-                
-                # Calculate simple similarity score based on common words
-                common_skills = set(reference_skills) & set(candidate_skills)
-                similarity_score = len(common_skills) / max(len(set(reference_skills)), 1)
-                
-                # Also factor in fit rating similarity
-                rating_similarity = 0
-                if reference.overall_fit_rating and candidate.overall_fit_rating:
-                    rating_diff = abs(reference.overall_fit_rating - candidate.overall_fit_rating)
-                    rating_similarity = max(0, 1 - rating_diff / 10)
-                
-                total_similarity = (similarity_score + rating_similarity) / 2
-                
-                if total_similarity > 0.1:  # Minimum threshold
-                    similar_candidates.append({
-                        'candidate': candidate,
-                        'similarity_score': total_similarity
-                    })
-            except:
-                continue
-    
-    # Sort by similarity and return top candidates
-    similar_candidates.sort(key=lambda x: x['similarity_score'], reverse=True)
+    details = {
+        row.id: row for row in db.session.query(
+            ResumeAnalysis.id, ResumeAnalysis.first_name, ResumeAnalysis.last_name,
+            ResumeAnalysis.email, ResumeAnalysis.filename
+        ).filter(ResumeAnalysis.id.in_([match[0] for match in top_matches]))
+    }
     
     result = []
-    for item in similar_candidates[:limit]:
-        candidate = item['candidate']
+    for match_id, strengths, similarity_score, overall_fit_rating in top_matches:
+        candidate = details[match_id]
         result.append({
-            'id': candidate.id,
+            'id': match_id,
             'name': f"{candidate.first_name or 'Unknown'} {candidate.last_name or ''}".strip(),
             'email': candidate.email,
             'filename': candidate.filename,
-            'overall_fit_rating': candidate.overall_fit_rating,
-            'similarity_score': round(item['similarity_score'], 2),
-            'strengths': json.loads(candidate.candidate_strengths) if candidate.candidate_strengths else []
+            'overall_fit_rating': overall_fit_rating,
+            'similarity_score': round(similarity_score, 2),
+            'strengths': _json_list(strengths)
         })
     
-    return result
\ No newline at end of file
+    return result
+
+@functools.lru_cache(maxsize=PARSED_JSON_CACHE_SIZE)
+def _parse_json_list(value: str):
+    """Parse a JSON list column, freezing lists so the cached value can't be mutated"""
+    parsed = json.loads(value)
+    return tuple(parsed) if isinstance(parsed, list) else parsed
+
+def _json_list(value: str):
+    """Parsed JSON list column as a fresh list (other JSON values are returned as parsed)"""
+    parsed = _parse_json_list(value)
+    return list(parsed) if isinstance(parsed, tuple) else parsed
+
+@functools.lru_cache(maxsize=PARSED_JSON_CACHE_SIZE)
+def _strength_words(candidate_strengths: str) -> frozenset:
+    """Lowercased words across a candidate's JSON strengths list"""
+    words = set()
+    for strength in _parse_json_list(candidate_strengths):
+        words.update(strength.lower().split())
+    return frozenset(words)
+
+def _score_similar_candidates(rows, reference_skills, reference_rating):
+    """Yield (id, strengths JSON, similarity, rating) for rows above the similarity threshold"""
+    max_overlap = max(len(reference_skills), 1)
+    for candidate_id, overall_fit_rating, candidate_strengths in rows:
+        if not candidate_strengths:
+            continue
+        try:
+            # Calculate simple similarity score based on common words
+            similarity_score = len(reference_skills.intersection(_strength_words(candidate_strengths))) / max_overlap
+        except:
+            continue
+        
+        # Also factor in fit rating similarity
+        rating_similarity = 0
+        if reference_rating and overall_fit_rating:
+            rating_diff = abs(reference_rating - overall_fit_rating)
+            rating_similarity = max(0, 1 - rating_diff / 10)
+        
+        total_similarity = (similarity_score + rating_similarity) / 2
+        
+        if total_similarity > 0.1:  # Minimum threshold
+            yield candidate_id, candidate_strengths, total_similarity, overall_fit_rating
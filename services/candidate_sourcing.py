@@ -3,25 +3,183 @@ Candidate Sourcing Service for TalentCompass AI
 Provides legitimate methods to source external candidates
 """
 
+import bisect
+import copy
+import difflib
+import functools
+import itertools
 import json
 import logging
+import re
+import threading
+import time
 import requests
-from typing import List, Dict, Any, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from types import MappingProxyType
+from typing import List, Dict, Any, Mapping, Optional, Tuple
+from collections import OrderedDict, defaultdict
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app
 from models import db, ResumeAnalysis, CandidateSkill
 from config import Config
 
+# Trades-specific skill keywords
+REQUIREMENT_SKILL_PATTERNS = (
+    # Construction
+    'framing', 'drywall', 'concrete', 'masonry', 'roofing', 'siding', 'flooring',
+    'carpentry', 'demolition', 'excavation', 'foundation', 'steel erection', 'scaffolding',
+    # HVAC
+    'hvac installation', 'hvac repair', 'ductwork', 'refrigeration', 'heat pump', 
+    'air conditioning', 'furnace', 'boiler', 'ventilation', 'sheet metal', 'brazing',
+    # Electrical
+    'electrical wiring', 'panel installation', 'circuit breaker', 'conduit', 'voltage',
+    'residential electrical', 'commercial electrical', 'industrial electrical', 'troubleshooting',
+    # Plumbing
+    'pipe fitting', 'soldering', 'drain cleaning', 'water heater', 'fixture installation',
+    'pex', 'copper', 'pvc', 'sewage', 'gas line', 'backflow prevention',
+    # Windows/Doors/Hurricane
+    'window installation', 'door installation', 'hurricane shutters', 'impact windows',
+    'sliding doors', 'garage doors', 'storm doors', 'weatherproofing', 'caulking',
+    # General skills
+    'blueprint reading', 'osha compliance', 'power tools', 'hand tools', 'measuring',
+    'safety protocols', 'code compliance', 'permit', 'inspection', 'estimation'
+)
+
+# Education patterns for trades
+REQUIREMENT_EDUCATION_PATTERNS = (
+    'trade school', 'vocational', 'apprenticeship', 'journeyman', 'master',
+    'technical college', 'community college', 'certification program'
+)
+
+# Trades certification patterns
+REQUIREMENT_CERT_PATTERNS = (
+    'osha 10', 'osha 30', 'epa certified', 'nate certified', 'journeyman license',
+    'master license', 'contractor license', 'electrical license', 'plumbing license',
+    'hvac license', 'cfc certification', 'backflow certification', 'welding certification',
+    'forklift certified', 'boom lift certified', 'scissor lift certified'
+)
+
+# Display labels, worked out once rather than on every extraction. Keywords are
+# lowercased and de-duplicated here, so each can be reported at most once per posting.
+_SKILL_LABELS = tuple(
+    (skill, skill.title() if len(skill) > 3 else skill.upper())
+    for skill in dict.fromkeys(skill.lower() for skill in REQUIREMENT_SKILL_PATTERNS)
+)
+_EDUCATION_LABELS = tuple(
+    (edu, edu.title()) for edu in dict.fromkeys(edu.lower() for edu in REQUIREMENT_EDUCATION_PATTERNS)
+)
+_CERT_LABELS = tuple(
+    (cert, cert.upper() if len(cert) <= 4 else cert.title())
+    for cert in dict.fromkeys(cert.lower() for cert in REQUIREMENT_CERT_PATTERNS)
+)
+
+# Experience ranges like "3-5 years" or "5+ years"
+_EXPERIENCE_RANGE_RE = re.compile(r'(\d+)[\s\-to]+(\d+)?\s*\+?\s*years?')
+
+# Wording that marks skills as required or preferred, and the sentence/line breaks
+# that bound a marker's reach
+_REQUIRED_MARKER_RE = re.compile(r'\b(?:required|must have|essential|mandatory)\b')
+_PREFERRED_MARKER_RE = re.compile(r'\b(?:preferred|nice to have|bonus|plus)\b')
+_SENTENCE_BREAK_RE = re.compile(r'[.;\n]')
+
+# Campaigns are often re-created for the same postings, so requirement extraction and
+# query generation are memoised
+REQUIREMENTS_CACHE_SIZE = 256
+SEARCH_QUERIES_CACHE_SIZE = 512
+
+# Connections kept per provider host by the shared HTTP session
+HTTP_POOL_SIZE = 32
+
+# GitHub rate limiting: when fewer than GITHUB_RATE_LIMIT_FLOOR calls remain, wait for
+# the window to reset; rate-limited replies are retried after these backoff delays.
+# Waits longer than GITHUB_MAX_RATE_LIMIT_WAIT seconds are not worth blocking for.
+GITHUB_RATE_LIMIT_FLOOR = 2
+GITHUB_BACKOFF_DELAYS = (0.5, 1, 2, 4)
+GITHUB_MAX_RATE_LIMIT_WAIT = 60
+
+# Profiles handled per query when bulk importing (keeps IN lists and INSERTs bounded)
+IMPORT_BATCH_SIZE = 1000
+
+# Large imports on PostgreSQL run their batches concurrently; each worker thread gets its
+# own app context, and so its own session and connection
+_IMPORT_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix='candidate-import')
+
+# Placeholder strengths/weaknesses for sourced profiles that haven't been analyzed yet
+_TO_BE_ANALYZED_JSON = json.dumps(["To be analyzed"])
+
+# Suffix that keeps sourced profile filenames unique within the same nanosecond
+_sourced_filename_seq = itertools.count()
+
+# Last ETag and result items per GitHub search, so repeat searches can be sent as
+# conditional requests; a 304 reply doesn't count against the rate limit
+GITHUB_ETAG_CACHE_SIZE = 1024
+_github_etag_cache = OrderedDict()
+_github_etag_lock = threading.Lock()
+
+# Provider searches for a profile search run side by side (room for two searches at once)
+_PROVIDER_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix='sourcing-provider')
+
+# Email-less candidates from different providers whose names are at least this similar
+# (SequenceMatcher ratio over the sorted, lowercased name words) are the same person
+FUZZY_NAME_THRESHOLD = 0.85
+
+# Provider results are cached per (provider, query, location, skills). GitHub is cheap
+# to re-ask; the paid providers are cached longer to spare their quotas. When a provider
+# comes back empty (it swallows errors such as 429s and timeouts), results up to
+# PROVIDER_STALE_TTL seconds old are served instead.
+PROVIDER_CACHE_TTLS = {'GitHub': 60, 'PeopleDataLabs': 300, 'SeekOut': 300, 'SourceHub': 300}
+PROVIDER_STALE_TTL = 900
+PROVIDER_CACHE_SIZE = 512
+_provider_cache = OrderedDict()
+_provider_cache_lock = threading.Lock()
+
+# Fields read from each GraphQL user search result (REST search returns accounts of
+# both kinds, so organisations are included too)
+GITHUB_GRAPHQL_USER_FIELDS = (
+    'nodes { ... on User { login url avatarUrl } ... on Organization { login url avatarUrl } }'
+)
+
+# GitHub skill searches are independent network calls, so they run concurrently
+_GITHUB_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix='github-search')
+
 class CandidateSourcingService:
     """Service for sourcing external candidates through legitimate channels"""
     
     def __init__(self):
         self.logger = logging.getLogger(__name__)
+        # Shared session keeps provider connections alive between calls. The pool is
+        # sized for concurrent searches, and transient gateway errors are retried
+        # with backoff (honouring Retry-After) before a provider is given up on.
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=HTTP_POOL_SIZE,
+            pool_maxsize=HTTP_POOL_SIZE,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=[502, 503, 504],
+                respect_retry_after_header=True,
+                raise_on_status=False
+            )
+        )
+        self.session.mount('https://', adapter)
+        # Rate limit state per GitHub token (one unauthenticated entry when none are
+        # configured), shared by the concurrent skill searches
+        self._github_tokens = [
+            {'token': token, 'remaining': None, 'reset': 0}
+            for token in Config.GITHUB_TOKENS or [None]
+        ]
+        self._github_token_index = 0
+        self._github_token_lock = threading.Lock()
     
     def search_public_profiles(self, 
                               job_title: str, 
                               location: str = None,
                               skills: List[str] = None,
-                              experience_years: int = None) -> List[Dict[str, Any]]:
+                              experience_years: int = None,
+                              fuzzy_threshold: Optional[float] = FUZZY_NAME_THRESHOLD) -> List[Dict[str, Any]]:
         """
         Search for candidates using multiple data sources
         
@@ -30,6 +188,8 @@ class CandidateSourcingService:
             location: Target location
             skills: Required skills
             experience_years: Minimum years of experience
+            fuzzy_threshold: Name similarity (0-1) at which email-less candidates from
+                different providers are merged; None to only merge exact names
         
         Returns:
             List of candidate profiles from multiple sources, deduplicated
@@ -53,11 +213,26 @@ class CandidateSourcingService:
             ('SourceHub', self._search_sourcehub)
         ]
         
-        sources_searched = []
+        # GitHub searches users by skill/language, so there is nothing to ask it without skills
+        if not skills:
+            self.logger.debug("No skills given, skipping GitHub search")
+            providers = providers[1:]
+        
+        # Providers are independent network calls, so they run concurrently; results
+        # are still gathered in provider order
+        searches = []
         for provider_name, search_method in providers:
+            self.logger.info(f"Searching {provider_name} for: {search_query}")
+            searches.append(
+                (provider_name, _PROVIDER_EXECUTOR.submit(
+                    self._search_provider_cached, provider_name, search_method, search_query, location, skills
+                ))
+            )
+        
+        sources_searched = []
+        for provider_name, search in searches:
             try:
-                self.logger.info(f"Searching {provider_name} for: {search_query}")
-                candidates = search_method(search_query, location, skills)
+                candidates = search.result()
                 if candidates:
                     all_candidates.extend(candidates)
                     sources_searched.append(provider_name)
@@ -66,7 +241,7 @@ class CandidateSourcingService:
                 self.logger.error(f"Error searching {provider_name}: {e}")
         
         # Deduplicate candidates by email or name
-        deduped_candidates = self._deduplicate_candidates(all_candidates)
+        deduped_candidates = self._deduplicate_candidates(all_candidates, fuzzy_threshold)
         
         # Add metadata about sources searched
         for candidate in deduped_candidates:
@@ -74,6 +249,38 @@ class CandidateSourcingService:
         
         return deduped_candidates
     
+    def _search_provider_cached(self, provider_name: str, search_method, query: str,
+                                location: Optional[str], skills: Optional[List[str]]) -> List[Dict[str, Any]]:
+        """
+        Run a provider search through the in-process result cache.
+        
+        Fresh results are reused for the provider's TTL. An empty reply falls back to
+        stale results, as providers report failures by returning nothing. Callers get
+        copies, so they can annotate candidates without touching the cache.
+        """
+        cache_key = (provider_name, query, location, tuple(skills or ()))
+        now = time.monotonic()
+        with _provider_cache_lock:
+            cached = _provider_cache.get(cache_key)
+            if cached:
+                _provider_cache.move_to_end(cache_key)
+        if cached and now - cached[0] < PROVIDER_CACHE_TTLS.get(provider_name, 0):
+            return copy.deepcopy(cached[1])
+        
+        candidates = search_method(query, location, skills)
+        
+        if candidates:
+            with _provider_cache_lock:
+                _provider_cache[cache_key] = (now, copy.deepcopy(candidates))
+                _provider_cache.move_to_end(cache_key)
+                if len(_provider_cache) > PROVIDER_CACHE_SIZE:
+                    _provider_cache.popitem(last=False)
+        elif cached and now - cached[0] < PROVIDER_STALE_TTL:
+            self.logger.warning(f"{provider_name} returned no results, serving results from {now - cached[0]:.0f}s ago")
+            return copy.deepcopy(cached[1])
+        
+        return candidates
+    
     def _search_github_profiles(self, query: str, location: str = None, skills: List[str] = None) -> List[Dict[str, Any]]:
         """
         Search GitHub for developer profiles (public data)
@@ -84,42 +291,204 @@ class CandidateSourcingService:
             # GitHub search API (public repositories and users)
             # This searches for users with specific languages/skills
             if skills:
-                for skill in skills[:2]:  # Limit to avoid rate limiting
-                    search_url = f"https://api.github.com/search/users"
-                    params = {
-                        'q': f"{skill} language:{skill}",
-                        'per_page': 5
-                    }
-                    
-                    headers = {
-                        'Accept': 'application/vnd.github.v3+json'
-                    }
-                    
-                    # Add GitHub token if available for higher rate limits
-                    if Config.GITHUB_TOKEN:
-                        headers['Authorization'] = f'token {Config.GITHUB_TOKEN}'
-                    
-                    response = requests.get(search_url, params=params, headers=headers, timeout=10)
-                    
-                    if response.status_code == 200:
-                        data = response.json()
-                        for user in data.get('items', []):
-                            candidate = {
-                                'source': 'GitHub',
-                                'profile_url': user.get('html_url'),
-                                'username': user.get('login'),
-                                'avatar_url': user.get('avatar_url'),
-                                'type': 'Developer',
-                                'skills': [skill],
-                                'location': location or 'Not specified'
-                            }
-                            candidates.append(candidate)
+                # With a token, one GraphQL request covers every skill search
+                if Config.GITHUB_TOKENS:
+                    graphql_candidates = self._search_github_graphql(skills[:2], location)
+                    if graphql_candidates is not None:
+                        return graphql_candidates
+                
+                headers = {
+                    'Accept': 'application/vnd.github.v3+json'
+                }
+                
+                # One search per skill, run concurrently; results keep skill order
+                searches = [
+                    _GITHUB_EXECUTOR.submit(self._search_github_skill, skill, location, headers)
+                    for skill in skills[:2]  # Limit to avoid rate limiting
+                ]
+                for search in searches:
+                    candidates.extend(search.result())
         
         except Exception as e:
             self.logger.error(f"Error searching GitHub profiles: {e}")
         
         return candidates
     
+    def _search_github_graphql(self, skills: List[str], location: Optional[str]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Search GitHub users for several skills in one GraphQL request (needs a token).
+        
+        Returns None if the request fails, so the caller can fall back to REST search.
+        """
+        searches = ' '.join(
+            f"s{index}: search(query: $q{index}, type: USER, first: 5) {{ {GITHUB_GRAPHQL_USER_FIELDS} }}"
+            for index in range(len(skills))
+        )
+        variables = ', '.join(f"$q{index}: String!" for index in range(len(skills)))
+        payload = {
+            'query': f"query({variables}) {{ {searches} }}",
+            'variables': {f"q{index}": f"{skill} language:{skill}" for index, skill in enumerate(skills)}
+        }
+        
+        response = self._github_request('POST', 'https://api.github.com/graphql', {}, json=payload)
+        if response.status_code != 200:
+            self.logger.warning(f"GitHub GraphQL search failed ({response.status_code}), using REST search")
+            return None
+        data = response.json()
+        if data.get('errors') or not data.get('data'):
+            self.logger.warning(f"GitHub GraphQL search failed ({data.get('errors')}), using REST search")
+            return None
+        
+        candidates = []
+        for index, skill in enumerate(skills):
+            for node in (data['data'].get(f"s{index}") or {}).get('nodes', []):
+                if not node:
+                    continue
+                candidates.append({
+                    'source': 'GitHub',
+                    'profile_url': node.get('url'),
+                    'username': node.get('login'),
+                    'avatar_url': node.get('avatarUrl'),
+                    'type': 'Developer',
+                    'skills': [skill],
+                    'location': location or 'Not specified'
+                })
+        return candidates
+    
+    def _search_github_skill(self, skill: str, location: Optional[str], headers: Dict[str, str]) -> List[Dict[str, Any]]:
+        """Search GitHub users for a single skill"""
+        search_url = f"https://api.github.com/search/users"
+        params = {
+            'q': f"{skill} language:{skill}",
+            'per_page': 5
+        }
+        
+        # Ask GitHub only for changes since the last identical search
+        cache_key = (search_url, tuple(sorted(params.items())))
+        with _github_etag_lock:
+            cached = _github_etag_cache.get(cache_key)
+            if cached:
+                _github_etag_cache.move_to_end(cache_key)
+        if cached:
+            headers = {**headers, 'If-None-Match': cached[0]}
+        
+        response = self._github_request('GET', search_url, headers, params=params)
+        
+        if response.status_code == 304 and cached:
+            items = cached[1]
+        elif response.status_code == 200:
+            items = response.json().get('items', [])
+            etag = response.headers.get('ETag')
+            if etag:
+                with _github_etag_lock:
+                    _github_etag_cache[cache_key] = (etag, items)
+                    _github_etag_cache.move_to_end(cache_key)
+                    if len(_github_etag_cache) > GITHUB_ETAG_CACHE_SIZE:
+                        _github_etag_cache.popitem(last=False)
+        else:
+            items = []
+        
+        candidates = []
+        for user in items:
+            candidate = {
+                'source': 'GitHub',
+                'profile_url': user.get('html_url'),
+                'username': user.get('login'),
+                'avatar_url': user.get('avatar_url'),
+                'type': 'Developer',
+                'skills': [skill],
+                'location': location or 'Not specified'
+            }
+            candidates.append(candidate)
+        return candidates
+    
+    def _github_request(self, method: str, url: str, headers: Dict[str, str], **kwargs) -> requests.Response:
+        """
+        Call the GitHub API, staying within its rate limit.
+        
+        Requests are spread round-robin over the configured tokens, skipping any that
+        are nearly used up. When every token is, waits for the earliest reset.
+        Rate-limited (403/429) replies are retried with backoff on the next token,
+        honouring Retry-After when no other token has budget left.
+        """
+        for attempt, backoff in enumerate(GITHUB_BACKOFF_DELAYS + (None,)):
+            token_state = self._next_github_token()
+            wait = token_state['reset'] - time.time()
+            if not self._github_token_available(token_state) and 0 < wait <= GITHUB_MAX_RATE_LIMIT_WAIT:
+                self.logger.info(f"GitHub rate limit nearly exhausted, waiting {wait:.0f}s for reset")
+                time.sleep(wait)
+            
+            request_headers = dict(headers)
+            if token_state['token']:
+                request_headers['Authorization'] = f"token {token_state['token']}"
+            response = self.session.request(method, url, headers=request_headers, timeout=10, **kwargs)
+            self._record_github_rate_limit(token_state, response)
+            
+            if backoff is None or not self._is_github_rate_limited(response):
+                return response
+            
+            with self._github_token_lock:
+                token_state['remaining'] = 0
+                other_token_available = any(
+                    self._github_token_available(state) for state in self._github_tokens
+                )
+            if other_token_available:
+                wait = backoff
+            else:
+                retry_after = response.headers.get('Retry-After')
+                if retry_after and retry_after.isdigit():
+                    wait = max(backoff, int(retry_after))
+                else:
+                    wait = max(backoff, token_state['reset'] - time.time())
+            if wait > GITHUB_MAX_RATE_LIMIT_WAIT:
+                self.logger.warning(f"GitHub rate limited for {wait:.0f}s, giving up on {url}")
+                return response
+            
+            self.logger.info(f"GitHub rate limited, retrying in {wait:.1f}s (attempt {attempt + 1})")
+            time.sleep(wait)
+        
+        return response
+    
+    def _next_github_token(self) -> Dict[str, Any]:
+        """Next token in round-robin order with budget left, else the one that resets first"""
+        with self._github_token_lock:
+            count = len(self._github_tokens)
+            for offset in range(count):
+                index = (self._github_token_index + offset) % count
+                token_state = self._github_tokens[index]
+                if self._github_token_available(token_state):
+                    self._github_token_index = (index + 1) % count
+                    return token_state
+            return min(self._github_tokens, key=lambda state: state['reset'])
+    
+    @staticmethod
+    def _github_token_available(token_state: Dict[str, Any]) -> bool:
+        """Whether a token has calls left, or its rate limit window has reset"""
+        remaining = token_state['remaining']
+        return (remaining is None or remaining >= GITHUB_RATE_LIMIT_FLOOR
+                or token_state['reset'] <= time.time())
+    
+    def _record_github_rate_limit(self, token_state: Dict[str, Any], response: requests.Response) -> None:
+        """Remember the rate limit a GitHub response reports for the token it used"""
+        remaining = response.headers.get('X-RateLimit-Remaining')
+        reset = response.headers.get('X-RateLimit-Reset')
+        if remaining is None or not remaining.isdigit():
+            return
+        with self._github_token_lock:
+            token_state['remaining'] = int(remaining)
+            if reset and reset.isdigit():
+                token_state['reset'] = int(reset)
+    
+    @staticmethod
+    def _is_github_rate_limited(response: requests.Response) -> bool:
+        """429, or a 403 that GitHub marks as a rate limit rather than a permission error"""
+        if response.status_code == 429:
+            return True
+        return response.status_code == 403 and (
+            response.headers.get('X-RateLimit-Remaining') == '0'
+            or 'Retry-After' in response.headers
+        )
+    
     def _search_peopledata(self, query: str, location: str = None, skills: List[str] = None) -> List[Dict[str, Any]]:
         """
         Search PeopleDataLabs for candidate profiles
@@ -144,7 +513,7 @@ class CandidateSourcingService:
                 params['skills'] = ','.join(skills[:5])  # Include top 5 skills
             
             # Make API request
-            response = requests.get(
+            response = self.session.get(
                 'https://api.peopledatalabs.com/v5/person/search',
                 params=params,
                 timeout=10
@@ -210,7 +579,7 @@ class CandidateSourcingService:
             }
             
             # Make API request
-            response = requests.post(
+            response = self.session.post(
                 'https://api.seekout.com/v1/talent/search',
                 headers=headers,
                 json=search_data,
@@ -275,7 +644,7 @@ class CandidateSourcingService:
             }
             
             # Make API request
-            response = requests.get(
+            response = self.session.get(
                 'https://api.sourcehub.com/v1/candidates/search',
                 headers=headers,
                 params=params,
@@ -342,9 +711,10 @@ class CandidateSourcingService:
         
         return min(score, 10.0)  # Cap at 10
     
-    def _deduplicate_candidates(self, candidates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _deduplicate_candidates(self, candidates: List[Dict[str, Any]],
+                                fuzzy_threshold: Optional[float] = FUZZY_NAME_THRESHOLD) -> List[Dict[str, Any]]:
         """
-        Deduplicate candidates by email or name
+        Deduplicate candidates by email or name, then merge near-identical names
         """
         seen_emails = set()
         seen_names = set()
@@ -369,67 +739,107 @@ class CandidateSourcingService:
             
             unique_candidates.append(candidate)
         
+        if fuzzy_threshold:
+            unique_candidates = self._merge_similar_names(unique_candidates, fuzzy_threshold)
+        
         return unique_candidates
     
-    def import_candidate_profile(self, profile_data: Dict[str, Any]) -> Optional[ResumeAnalysis]:
+    @staticmethod
+    def _merge_similar_names(candidates: List[Dict[str, Any]], threshold: float) -> List[Dict[str, Any]]:
+        """
+        Collapse email-less candidates from different providers whose names nearly match
+        ("Jon Smith" / "John Smith"). Each group keeps its longest name, in the position
+        of its first member, and takes any fields that record lacks (profile URLs etc.)
+        from the others; string lists such as skills are combined and 'sources' lists
+        every provider.
+        Results from one provider are never merged with each other.
+        """
+        named = []
+        for index, candidate in enumerate(candidates):
+            name = (candidate.get('name') or '').lower().strip()
+            if name and not (candidate.get('email') or '').strip():
+                named.append((index, ' '.join(sorted(name.split())), candidate.get('source')))
+        if len(named) < 2:
+            return candidates
+        
+        parent = list(range(len(candidates)))
+        group_sources = {index: {source} for index, _, source in named}
+        
+        def find(index):
+            while parent[index] != index:
+                parent[index] = parent[parent[index]]
+                index = parent[index]
+            return index
+        
+        # Cheap upper bounds first; the full ratio only runs for plausible pairs. Groups
+        # only join when they share no provider, so chains can't merge one provider's results.
+        matcher = difflib.SequenceMatcher(autojunk=False)
+        for position, (index, name_key, source) in enumerate(named):
+            matcher.set_seq2(name_key)
+            for other_index, other_key, other_source in named[position + 1:]:
+                root, other_root = find(index), find(other_index)
+                if root == other_root or group_sources[root] & group_sources[other_root]:
+                    continue
+                matcher.set_seq1(other_key)
+                if (matcher.real_quick_ratio() >= threshold and matcher.quick_ratio() >= threshold
+                        and matcher.ratio() >= threshold):
+                    parent[other_root] = root
+                    group_sources[root] |= group_sources.pop(other_root)
+        
+        groups = defaultdict(list)
+        for index in range(len(candidates)):
+            groups[find(index)].append(index)
+        
+        merged = []
+        for index, candidate in enumerate(candidates):
+            members = groups[find(index)]
+            if members[0] != index:
+                continue
+            if len(members) == 1:
+                merged.append(candidate)
+                continue
+            
+            keep = max(members, key=lambda member: len((candidates[member].get('name') or '').strip()))
+            combined = dict(candidates[keep])
+            for member in members:
+                if member == keep:
+                    continue
+                for key, value in candidates[member].items():
+                    current = combined.get(key)
+                    if not current:
+                        combined[key] = value
+                    elif (isinstance(current, list) and isinstance(value, list)
+                            and all(isinstance(item, str) for item in current + value)):
+                        combined[key] = list(dict.fromkeys(current + value))
+            combined['sources'] = list(dict.fromkeys(
+                candidates[member].get('source') for member in members if candidates[member].get('source')
+            ))
+            merged.append(combined)
+        return merged
+    
+    def import_candidate_profile(self, profile_data: Dict[str, Any], check_existing: bool = True) -> Optional[ResumeAnalysis]:
         """
         Import an external candidate profile into the system
         
         Args:
             profile_data: Dictionary containing candidate information
+            check_existing: Look up the email first; callers that already did can skip it
         
         Returns:
             Created ResumeAnalysis object or None
         """
         try:
-            # Extract basic information
-            first_name = profile_data.get('first_name', '')
-            last_name = profile_data.get('last_name', '')
             email = profile_data.get('email', '')
             
             # Check if candidate already exists
-            if email:
+            if email and check_existing:
                 existing = ResumeAnalysis.query.filter_by(email=email).first()
                 if existing:
                     self.logger.info(f"Candidate already exists: {email}")
                     return existing
             
-            # Create profile summary
-            profile_summary = self._create_profile_summary(profile_data)
-            
-            # Create new candidate record
-            candidate = ResumeAnalysis(
-                first_name=first_name,
-                last_name=last_name,
-                email=email or f"{first_name.lower()}.{last_name.lower()}@sourced.example.com",
-                phone=profile_data.get('phone', ''),
-                location=profile_data.get('location', ''),
-                resume_text=profile_summary,
-                source='external_sourcing',
-                status='sourced',
-                filename=f"sourced_profile_{datetime.utcnow().timestamp()}.txt",
-                upload_date=datetime.utcnow()
-            )
-            
-            # Set default values for now
-            # Could integrate with AI analysis later if needed
-            candidate.candidate_strengths = json.dumps(["To be analyzed"])
-            candidate.candidate_weaknesses = json.dumps(["To be analyzed"])
-            candidate.overall_fit_rating = 5.0
-            
+            candidate = self._build_candidate(profile_data)
             db.session.add(candidate)
-            db.session.flush()
-            
-            # Add skills
-            skills = profile_data.get('skills', [])
-            for skill_name in skills:
-                skill = CandidateSkill(
-                    candidate_id=candidate.id,
-                    skill_name=skill_name,
-                    skill_level='unknown'
-                )
-                db.session.add(skill)
-            
             db.session.commit()
             return candidate
             
@@ -438,39 +848,83 @@ class CandidateSourcingService:
             self.logger.error(f"Error importing candidate profile: {e}")
             return None
     
-    def _create_profile_summary(self, profile_data: Dict[str, Any]) -> str:
-        """Create a text summary from profile data"""
-        parts = []
+    def _build_candidate(self, profile_data: Dict[str, Any], now: datetime = None) -> ResumeAnalysis:
+        """
+        Create an unsaved candidate record, with its skills, from an external profile.
         
-        # Name and title
-        if profile_data.get('first_name'):
-            parts.append(f"Name: {profile_data.get('first_name')} {profile_data.get('last_name', '')}")
+        Batch imports pass one `now` so every profile in the batch shares an upload date.
+        """
+        # Extract basic information
+        first_name = profile_data.get('first_name', '')
+        last_name = profile_data.get('last_name', '')
+        email = profile_data.get('email', '')
         
-        if profile_data.get('title'):
-            parts.append(f"Current Role: {profile_data.get('title')}")
+        # Create profile summary
+        profile_summary = self._create_profile_summary(profile_data)
         
-        if profile_data.get('company'):
-            parts.append(f"Company: {profile_data.get('company')}")
+        # Create new candidate record
+        candidate = ResumeAnalysis(
+            first_name=first_name,
+            last_name=last_name,
+            email=email or f"{first_name.lower()}.{last_name.lower()}@sourced.example.com",
+            phone=profile_data.get('phone', ''),
+            location=profile_data.get('location', ''),
+            resume_text=profile_summary,
+            source='external_sourcing',
+            status='sourced',
+            filename=f"sourced_profile_{time.time_ns()}_{next(_sourced_filename_seq)}.txt",
+            upload_date=now or datetime.utcnow()
+        )
         
-        if profile_data.get('location'):
-            parts.append(f"Location: {profile_data.get('location')}")
+        # Set default values for now
+        # Could integrate with AI analysis later if needed
+        candidate.candidate_strengths = _TO_BE_ANALYZED_JSON
+        candidate.candidate_weaknesses = _TO_BE_ANALYZED_JSON
+        candidate.overall_fit_rating = 5.0
         
-        # Experience
-        if profile_data.get('experience'):
-            parts.append(f"\nExperience:\n{profile_data.get('experience')}")
+        # Add skills (inserted with the candidate when the session flushes)
+        for skill_name in profile_data.get('skills', []):
+            candidate.skills.append(CandidateSkill(
+                skill_name=skill_name,
+                skill_level='unknown'
+            ))
         
-        # Skills
-        if profile_data.get('skills'):
-            skills_text = ', '.join(profile_data.get('skills', []))
-            parts.append(f"\nSkills: {skills_text}")
+        return candidate
+    
+    def _create_profile_summary(self, profile_data: Dict[str, Any]) -> str:
+        """Create a text summary from profile data"""
+        # Each field is read once
+        get = profile_data.get
+        first_name = get('first_name')
+        title = get('title')
+        company = get('company')
+        location = get('location')
+        experience = get('experience')
+        skills = get('skills')
+        education = get('education')
+        summary = get('summary')
         
-        # Education
-        if profile_data.get('education'):
-            parts.append(f"\nEducation:\n{profile_data.get('education')}")
+        parts = []
         
-        # Summary
-        if profile_data.get('summary'):
-            parts.append(f"\nSummary:\n{profile_data.get('summary')}")
+        # Name and title
+        if first_name:
+            parts.append(f"Name: {first_name} {get('last_name', '')}")
+        if title:
+            parts.append(f"Current Role: {title}")
+        if company:
+            parts.append(f"Company: {company}")
+        if location:
+            parts.append(f"Location: {location}")
+        
+        # Experience, skills, education and summary paragraphs
+        if experience:
+            parts.append(f"\nExperience:\n{experience}")
+        if skills:
+            parts.append(f"\nSkills: {', '.join(skills)}")
+        if education:
+            parts.append(f"\nEducation:\n{education}")
+        if summary:
+            parts.append(f"\nSummary:\n{summary}")
         
         return '\n'.join(parts)
     
@@ -492,24 +946,176 @@ class CandidateSourcingService:
             'candidates': []
         }
         
-        for profile_data in candidates_data:
-            try:
-                candidate = self.import_candidate_profile(profile_data)
+        # Look up which emails already exist in one query per batch, rather than one
+        # query per profile
+        emails = list({profile.get('email') for profile in candidates_data if profile.get('email')})
+        existing_candidates = {}
+        for start in range(0, len(emails), IMPORT_BATCH_SIZE):
+            rows = db.session.query(
+                ResumeAnalysis.id, ResumeAnalysis.first_name, ResumeAnalysis.last_name, ResumeAnalysis.email
+            ).filter(ResumeAnalysis.email.in_(emails[start:start + IMPORT_BATCH_SIZE])).all()
+            existing_candidates.update((row.email, row) for row in rows)
+        
+        batches = [
+            candidates_data[start:start + IMPORT_BATCH_SIZE]
+            for start in range(0, len(candidates_data), IMPORT_BATCH_SIZE)
+        ]
+        # SQLite serialises writers, so only PostgreSQL gains from concurrent batches
+        if len(batches) > 1 and db.engine.dialect.name == 'postgresql':
+            imported_batches = self._import_batches_concurrently(batches, existing_candidates)
+        else:
+            imported_batches = self._import_batches(batches, existing_candidates)
+        
+        for batch, imported in zip(batches, imported_batches):
+            if imported is None:
+                results['errors'] += len(batch)
+                continue
+            
+            for candidate in imported:
                 if candidate:
                     results['imported'] += 1
-                    results['candidates'].append({
-                        'id': candidate.id,
-                        'name': f"{candidate.first_name} {candidate.last_name}",
-                        'email': candidate.email
-                    })
+                    results['candidates'].append(candidate)
                 else:
                     results['skipped'] += 1
-            except Exception as e:
-                results['errors'] += 1
-                self.logger.error(f"Error importing candidate: {e}")
         
         return results
     
+    def _import_batches(self, batches: List[List[Dict[str, Any]]], existing_candidates: Dict[str, Any]):
+        """Import batches one after another, yielding each batch's results (None if it failed)"""
+        for batch in batches:
+            try:
+                yield self._import_batch(batch, existing_candidates)
+            except Exception as e:
+                self.logger.error(f"Error importing candidates: {e}")
+                yield None
+    
+    def _import_batches_concurrently(self, batches: List[List[Dict[str, Any]]], existing_candidates: Dict[str, Any]) -> List[Optional[List[Optional[Dict[str, Any]]]]]:
+        """
+        Import batches on worker threads, returning each batch's results (None if it failed).
+        
+        A new email repeated across batches is only imported by the first batch it
+        appears in. Later occurrences are held back and resolved in order once every
+        batch has finished, matching a one-batch-at-a-time import.
+        """
+        first_batch = {}
+        held_back = set()
+        worker_batches = []
+        for index, batch in enumerate(batches):
+            worker_batch = []
+            for position, profile_data in enumerate(batch):
+                email = profile_data.get('email')
+                if email and email not in existing_candidates and first_batch.setdefault(email, index) != index:
+                    held_back.add((index, position))
+                else:
+                    worker_batch.append(profile_data)
+            worker_batches.append(worker_batch)
+        
+        app = current_app._get_current_object()
+        futures = [
+            _IMPORT_EXECUTOR.submit(
+                _run_in_app_context, app, self._import_batch, worker_batch, dict(existing_candidates)
+            )
+            for worker_batch in worker_batches
+        ]
+        worker_results = []
+        for future in futures:
+            try:
+                worker_results.append(future.result())
+            except Exception as e:
+                self.logger.error(f"Error importing candidates: {e}")
+                worker_results.append(None)
+        
+        imported_emails = {
+            summary['email']: summary
+            for imported in worker_results if imported
+            for summary in imported if summary
+        }
+        imported_batches = []
+        for index, (batch, imported) in enumerate(zip(batches, worker_results)):
+            if imported is None:
+                imported_batches.append(None)
+                continue
+            
+            imported = iter(imported)
+            batch_results = []
+            for position, profile_data in enumerate(batch):
+                if (index, position) not in held_back:
+                    batch_results.append(next(imported))
+                    continue
+                
+                email = profile_data['email']
+                summary = imported_emails.get(email)
+                if summary:
+                    self.logger.info(f"Candidate already exists: {email}")
+                else:
+                    candidate = self.import_candidate_profile(profile_data, check_existing=False)
+                    if candidate:
+                        summary = imported_emails[email] = self._import_summary(candidate)
+                batch_results.append(summary)
+            imported_batches.append(batch_results)
+        
+        return imported_batches
+    
+    def _import_batch(self, batch: List[Dict[str, Any]], existing_candidates: Dict[str, Any]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Import a batch of profiles with a single flush and commit, so candidates and
+        their skills each go in as one multi-row INSERT. Profiles whose email is in
+        existing_candidates are reported rather than re-created.
+        
+        If the batch fails (e.g. a clashing generated email) it is rolled back and
+        retried one profile at a time, so only the bad profiles are skipped.
+        
+        Returns:
+            A result summary, or None when the profile was skipped, per profile in order
+        """
+        candidates = []
+        new_emails = []
+        now = datetime.utcnow()
+        try:
+            for profile_data in batch:
+                email = profile_data.get('email')
+                candidate = existing_candidates.get(email) if email else None
+                if candidate:
+                    self.logger.info(f"Candidate already exists: {email}")
+                else:
+                    candidate = self._build_candidate(profile_data, now)
+                    db.session.add(candidate)
+                    if email:
+                        existing_candidates[email] = candidate
+                        new_emails.append(email)
+                candidates.append(candidate)
+            
+            db.session.flush()
+            imported = [self._import_summary(candidate) for candidate in candidates]
+            db.session.commit()
+            return imported
+        
+        except Exception as e:
+            db.session.rollback()
+            for email in new_emails:
+                existing_candidates.pop(email, None)
+            self.logger.warning(f"Batch import failed, importing profiles one at a time: {e}")
+        
+        imported = []
+        for profile_data in batch:
+            email = profile_data.get('email')
+            candidate = existing_candidates.get(email) if email else None
+            if not candidate:
+                candidate = self.import_candidate_profile(profile_data, check_existing=False)
+                if candidate and email:
+                    existing_candidates[email] = candidate
+            imported.append(self._import_summary(candidate) if candidate else None)
+        return imported
+    
+    @staticmethod
+    def _import_summary(candidate) -> Dict[str, Any]:
+        """Summary of an imported (or already existing) candidate for import results"""
+        return {
+            'id': candidate.id,
+            'name': f"{candidate.first_name} {candidate.last_name}",
+            'email': candidate.email
+        }
+    
     def create_sourcing_campaign(self, 
                                 job_title: str,
                                 requirements: str,
@@ -540,20 +1146,21 @@ class CandidateSourcingService:
                 'education': extracted.get('education', []),
                 'certifications': extracted.get('certifications', [])
             },
-            'search_queries': self._generate_search_queries(
+            'search_queries': list(self._generate_search_queries(
                 job_title, 
                 location,
-                extracted.get('required_skills', [])
-            )
+                tuple(extracted.get('required_skills', []))
+            ))
         }
         
         return campaign
     
-    def _generate_search_queries(self, 
-                                job_title: str, 
+    @staticmethod
+    @functools.lru_cache(maxsize=SEARCH_QUERIES_CACHE_SIZE)
+    def _generate_search_queries(job_title: str, 
                                 location: str,
-                                skills: List[str]) -> List[str]:
-        """Generate optimized search queries for different platforms"""
+                                skills: Tuple[str, ...]) -> Tuple[str, ...]:
+        """Generate optimized search queries for different platforms (cached, so returned as a tuple)"""
         queries = []
         
         # Basic query
@@ -577,71 +1184,34 @@ class CandidateSourcingService:
                 boolean_query += f' AND "{location}"'
             queries.append(boolean_query)
         
-        return queries
+        return tuple(queries)
     
     def _extract_requirements_simple(self, requirements: str) -> Dict[str, Any]:
         """Simple keyword extraction from requirements text"""
-        import re
-        
-        # Trades-specific skill keywords
-        skill_patterns = [
-            # Construction
-            'framing', 'drywall', 'concrete', 'masonry', 'roofing', 'siding', 'flooring',
-            'carpentry', 'demolition', 'excavation', 'foundation', 'steel erection', 'scaffolding',
-            # HVAC
-            'hvac installation', 'hvac repair', 'ductwork', 'refrigeration', 'heat pump', 
-            'air conditioning', 'furnace', 'boiler', 'ventilation', 'sheet metal', 'brazing',
-            # Electrical
-            'electrical wiring', 'panel installation', 'circuit breaker', 'conduit', 'voltage',
-            'residential electrical', 'commercial electrical', 'industrial electrical', 'troubleshooting',
-            # Plumbing
-            'pipe fitting', 'soldering', 'drain cleaning', 'water heater', 'fixture installation',
-            'pex', 'copper', 'pvc', 'sewage', 'gas line', 'backflow prevention',
-            # Windows/Doors/Hurricane
-            'window installation', 'door installation', 'hurricane shutters', 'impact windows',
-            'sliding doors', 'garage doors', 'storm doors', 'weatherproofing', 'caulking',
-            # General skills
-            'blueprint reading', 'osha compliance', 'power tools', 'hand tools', 'measuring',
-            'safety protocols', 'code compliance', 'permit', 'inspection', 'estimation'
-        ]
-        
-        # Education patterns for trades
-        education_patterns = [
-            'trade school', 'vocational', 'apprenticeship', 'journeyman', 'master',
-            'technical college', 'community college', 'certification program'
-        ]
-        
-        # Trades certification patterns
-        cert_patterns = [
-            'osha 10', 'osha 30', 'epa certified', 'nate certified', 'journeyman license',
-            'master license', 'contractor license', 'electrical license', 'plumbing license',
-            'hvac license', 'cfc certification', 'backflow certification', 'welding certification',
-            'forklift certified', 'boom lift certified', 'scissor lift certified'
-        ]
+        extracted = self._extract_requirements_cached(requirements)
+        return {
+            key: list(value) if isinstance(value, tuple) else value
+            for key, value in extracted.items()
+        }
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=REQUIREMENTS_CACHE_SIZE)
+    def _extract_requirements_cached(requirements: str) -> Mapping[str, Any]:
+        """
+        Cached keyword extraction behind _extract_requirements_simple.
         
+        The result is shared by every caller, so it is read-only: a mapping proxy
+        with tuples for the lists.
+        """
         requirements_lower = requirements.lower()
         
-        # Extract skills
-        found_skills = []
-        for skill in skill_patterns:
-            if skill in requirements_lower:
-                found_skills.append(skill.title() if len(skill) > 3 else skill.upper())
-        
-        # Extract education
-        found_education = []
-        for edu in education_patterns:
-            if edu in requirements_lower:
-                found_education.append(edu.title())
-        
-        # Extract certifications
-        found_certs = []
-        for cert in cert_patterns:
-            if cert in requirements_lower:
-                found_certs.append(cert.upper() if len(cert) <= 4 else cert.title())
+        # Extract skills, education and certifications
+        found_skills = [(skill, label) for skill, label in _SKILL_LABELS if skill in requirements_lower]
+        found_education = [label for edu, label in _EDUCATION_LABELS if edu in requirements_lower]
+        found_certs = [label for cert, label in _CERT_LABELS if cert in requirements_lower]
         
         # Extract experience range (look for patterns like "3-5 years", "5+ years")
-        exp_pattern = r'(\d+)[\s\-to]+(\d+)?\s*\+?\s*years?'
-        exp_match = re.search(exp_pattern, requirements_lower)
+        exp_match = _EXPERIENCE_RANGE_RE.search(requirements_lower)
         experience_range = '3-5 years'  # default
         if exp_match:
             if exp_match.group(2):
@@ -650,19 +1220,65 @@ class CandidateSourcingService:
                 experience_range = f"{exp_match.group(1)}+ years"
         
         # Classify skills as required vs preferred
-        required_keywords = ['required', 'must have', 'essential', 'mandatory']
-        preferred_keywords = ['preferred', 'nice to have', 'bonus', 'plus']
-        
-        required_skills = found_skills[:5] if found_skills else []
-        preferred_skills = found_skills[5:] if len(found_skills) > 5 else []
+        required_skills, preferred_skills = CandidateSourcingService._split_required_preferred(
+            requirements_lower, found_skills
+        )
         
-        return {
-            'required_skills': required_skills,
-            'preferred_skills': preferred_skills,
+        return MappingProxyType({
+            'required_skills': tuple(required_skills),
+            'preferred_skills': tuple(preferred_skills),
             'experience_range': experience_range,
-            'education': found_education,
-            'certifications': found_certs
-        }
+            'education': tuple(found_education),
+            'certifications': tuple(found_certs)
+        })
+
+    
+    @staticmethod
+    def _split_required_preferred(requirements_lower: str, found_skills: List[Tuple[str, str]]) -> Tuple[List[str], List[str]]:
+        """
+        Split found (keyword, label) skills into required and preferred labels.
+        
+        A skill follows the closest required/preferred wording in its own sentence or
+        line ("Framing required", "welding a plus"), else the closest before it, as
+        under a "Nice to have:" heading. Skills before any such wording are required.
+        Without any, the first five skills are required and the rest preferred.
+        """
+        markers = sorted(
+            [(match.start(), True) for match in _REQUIRED_MARKER_RE.finditer(requirements_lower)]
+            + [(match.start(), False) for match in _PREFERRED_MARKER_RE.finditer(requirements_lower)]
+        )
+        if not markers:
+            labels = [label for _, label in found_skills]
+            return labels[:5], labels[5:]
+        
+        marker_positions = [position for position, _ in markers]
+        breaks = [match.start() for match in _SENTENCE_BREAK_RE.finditer(requirements_lower)]
+        required_skills, preferred_skills = [], []
+        for skill, label in found_skills:
+            position = requirements_lower.find(skill)
+            
+            # Sentence holding the skill, and the markers inside it
+            break_index = bisect.bisect_left(breaks, position)
+            sentence_start = breaks[break_index - 1] if break_index else -1
+            sentence_end = breaks[break_index] if break_index < len(breaks) else len(requirements_lower)
+            first = bisect.bisect_right(marker_positions, sentence_start)
+            last = bisect.bisect_left(marker_positions, sentence_end)
+            
+            if first < last:
+                _, is_required = min(markers[first:last], key=lambda marker: abs(marker[0] - position))
+            else:
+                preceding = bisect.bisect_left(marker_positions, position) - 1
+                is_required = preceding < 0 or markers[preceding][1]
+            
+            (required_skills if is_required else preferred_skills).append(label)
+        
+        return required_skills, preferred_skills
+
+
+def _run_in_app_context(app, function, *args):
+    """Call a function from a worker thread with its own app context"""
+    with app.app_context():
+        return function(*args)
 
 
 # Standalone function for external candidate search (used by routes.py)
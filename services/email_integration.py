@@ -11,7 +11,7 @@ from datetime import datetime
 from app import db
 from models import ResumeAnalysis, EmailProcessingLog
 from services.text_extraction import extract_text_from_file
-from services.ai_analysis import analyze_resume, extract_candidate_info
+from services.ai_analysis import analyze_resume, extract_candidate_info_batch
 from services.job_boards import search_relevant_jobs
 
 class EmailResumeProcessor:
@@ -66,22 +66,30 @@ class EmailResumeProcessor:
             # Search for unread emails with attachments
             _, message_ids = mail.search(None, 'UNSEEN')
             
+            # Resume text is pulled from every message first so contact extraction runs
+            # as one batched request (per chunk) instead of one OpenAI call per email.
+            pending = []
             for message_id in message_ids[0].split():
                 try:
-                    result = self._process_email_message(mail, message_id, job_description)
-                    
-                    if result["status"] == "processed":
-                        results["processed"] += 1
-                        if result.get("candidate"):
-                            results["candidates"].append(result["candidate"])
-                    elif result["status"] == "failed":
-                        results["failed"] += 1
-                    else:
-                        results["skipped"] += 1
-                        
+                    result = self._prepare_email_message(mail, message_id)
                 except Exception as e:
                     logging.error(f"Error processing email {message_id}: {str(e)}")
-                    results["failed"] += 1
+                    result = {"status": "failed"}
+                
+                if result["status"] == "pending":
+                    pending.append(result)
+                else:
+                    self._count_result(results, result)
+            
+            if pending:
+                candidate_infos = extract_candidate_info_batch([item['resume_text'] for item in pending])
+                for item, candidate_info in zip(pending, candidate_infos):
+                    try:
+                        result = self._save_email_candidate(mail, item, candidate_info, job_description)
+                    except Exception as e:
+                        logging.error(f"Error processing email {item['message_id']}: {str(e)}")
+                        result = {"status": "failed"}
+                    self._count_result(results, result)
                     
         except Exception as e:
             logging.error(f"Error processing emails: {str(e)}")
@@ -92,40 +100,63 @@ class EmailResumeProcessor:
         
         return results
     
-    def _process_email_message(self, mail: imaplib.IMAP4_SSL, message_id: bytes, job_description: str = None) -> Dict[str, Any]:
-        """Process a single email message"""
+    def _count_result(self, results: Dict[str, Any], result: Dict[str, Any]) -> None:
+        """Add one message's outcome to the process_new_emails totals"""
+        if result["status"] == "processed":
+            results["processed"] += 1
+            if result.get("candidate"):
+                results["candidates"].append(result["candidate"])
+        elif result["status"] == "failed":
+            results["failed"] += 1
+        else:
+            results["skipped"] += 1
+    
+    def _log_email(self, pending: Dict[str, Any], status: str, **fields) -> None:
+        """Record the outcome of processing a message"""
+        log_entry = EmailProcessingLog(
+            email_id=pending['email_id'],
+            sender_email=pending['sender'],
+            subject=pending['subject'],
+            status=status,
+            **fields
+        )
+        db.session.add(log_entry)
+        db.session.commit()
+    
+    def _prepare_email_message(self, mail: imaplib.IMAP4_SSL, message_id: bytes) -> Dict[str, Any]:
+        """Fetch a message and extract the text of its first resume attachment
         
+        Returns {"status": "pending", ...} with the message details and resume text,
+        or a skipped/failed result (already logged) when there is nothing to analyze.
+        """
         _, msg_data = mail.fetch(message_id, '(RFC822)')
         email_body = msg_data[0][1]
         email_message = email.message_from_bytes(email_body)
         
         # Extract email metadata
-        sender = email_message['From']
-        subject = email_message['Subject'] or 'No Subject'
-        email_id = email_message['Message-ID']
+        pending = {
+            "status": "pending",
+            "message_id": message_id,
+            "email_message": email_message,
+            "sender": email_message['From'],
+            "subject": email_message['Subject'] or 'No Subject',
+            "email_id": email_message['Message-ID']
+        }
         
         # Check if already processed
-        if EmailProcessingLog.query.filter_by(email_id=email_id).first():
+        if EmailProcessingLog.query.filter_by(email_id=pending['email_id']).first():
             return {"status": "skipped", "reason": "already_processed"}
         
         # Look for resume attachments
         resume_attachments = self._extract_resume_attachments(email_message)
         
         if not resume_attachments:
-            # Log as skipped
-            log_entry = EmailProcessingLog(
-                email_id=email_id,
-                sender_email=sender,
-                subject=subject,
-                status='skipped',
-                error_message='No resume attachments found'
-            )
-            db.session.add(log_entry)
-            db.session.commit()
+            self._log_email(pending, 'skipped', error_message='No resume attachments found')
             return {"status": "skipped", "reason": "no_attachments"}
         
         # Process the first resume attachment
         attachment = resume_attachments[0]
+        pending['filename'] = attachment['filename']
         
         try:
             # Save attachment temporarily
@@ -133,15 +164,31 @@ class EmailResumeProcessor:
                 temp_file.write(attachment['content'])
                 temp_filepath = temp_file.name
             
-            # Extract text from resume
-            resume_text = extract_text_from_file(temp_filepath)
+            try:
+                # Extract text from resume
+                resume_text = extract_text_from_file(temp_filepath)
+            finally:
+                # Clean up temp file
+                os.unlink(temp_filepath)
             
             if not resume_text.strip():
                 raise Exception("Could not extract text from resume")
             
-            # Extract candidate information
-            candidate_info = extract_candidate_info(resume_text)
-            
+        except Exception as e:
+            self._log_email(pending, 'failed', error_message=str(e))
+            return {"status": "failed", "error": str(e)}
+        
+        pending['resume_text'] = resume_text
+        return pending
+    
+    def _save_email_candidate(self, mail: imaplib.IMAP4_SSL, pending: Dict[str, Any], candidate_info: Dict[str, Any], job_description: str = None) -> Dict[str, Any]:
+        """Analyze and store a prepared message's resume using its extracted candidate info"""
+        
+        email_message = pending['email_message']
+        sender = pending['sender']
+        resume_text = pending['resume_text']
+        
+        try:
             # Use provided job description or extract from email
             analysis_job_description = job_description or self._extract_job_description_from_email(email_message)
             
@@ -158,7 +205,7 @@ class EmailResumeProcessor:
             
             # Save to database
             resume_analysis = ResumeAnalysis(
-                filename=attachment['filename'],
+                filename=pending['filename'],
                 first_name=candidate_info.get('first_name'),
                 last_name=candidate_info.get('last_name'),
                 email=candidate_info.get('email') or sender,
@@ -172,6 +219,7 @@ class EmailResumeProcessor:
                 reward_factor_explanation=analysis_result.get('reward_factor', {}).get('explanation') if analysis_result else None,
                 overall_fit_rating=analysis_result.get('overall_fit_rating') if analysis_result else None,
                 justification=analysis_result.get('justification_for_rating') if analysis_result else None,
+                scout_summary=candidate_info.get('scout_summary'),
                 relevant_jobs=json.dumps(relevant_jobs)
             )
             
@@ -179,21 +227,10 @@ class EmailResumeProcessor:
             db.session.flush()  # Get the ID
             
             # Log successful processing
-            log_entry = EmailProcessingLog(
-                email_id=email_id,
-                sender_email=sender,
-                subject=subject,
-                status='processed',
-                resume_analysis_id=resume_analysis.id
-            )
-            db.session.add(log_entry)
-            db.session.commit()
-            
-            # Clean up temp file
-            os.unlink(temp_filepath)
+            self._log_email(pending, 'processed', resume_analysis_id=resume_analysis.id)
             
             # Mark email as read and optionally move to processed folder
-            mail.store(message_id, '+FLAGS', '\\Seen')
+            mail.store(pending['message_id'], '+FLAGS', '\\Seen')
             
             return {
                 "status": "processed",
@@ -202,23 +239,8 @@ class EmailResumeProcessor:
             
         except Exception as e:
             # Log failed processing
-            log_entry = EmailProcessingLog(
-                email_id=email_id,
-                sender_email=sender,
-                subject=subject,
-                status='failed',
-                error_message=str(e)
-            )
-            db.session.add(log_entry)
-            db.session.commit()
+            self._log_email(pending, 'failed', error_message=str(e))
             
-            # Clean up temp file if it exists
-            if 'temp_filepath' in locals():
-                try:
-                    os.unlink(temp_filepath)
-                except:
-                    pass
-                    
             return {"status": "failed", "error": str(e)}
     
     def _extract_resume_attachments(self, email_message) -> List[Dict[str, Any]]:
@@ -4,11 +4,13 @@ Based on awesome-recruitment repository resources
 """
 
 import json
+import os
 import re
 import requests
 import logging
 from typing import List, Dict, Any, Optional
 from datetime import datetime
+from urllib.parse import quote
 
 class SourcingToolbox:
     """Advanced sourcing tools and utilities for recruitment professionals"""
@@ -195,7 +197,6 @@ class SourcingToolbox:
         Returns:
             Developer statistics including repos, languages, contributions
         """
-        import os
         try:
             headers = {'Accept': 'application/vnd.github.v3+json'}
             
@@ -292,7 +293,6 @@ class SourcingToolbox:
         links = {}
         
         # URL encode the parameters
-        from urllib.parse import quote
         encoded_name = quote(name)
         encoded_company = quote(company) if company else ''
         
@@ -430,8 +430,6 @@ class SourcingToolbox:
         Returns:
             Dictionary of salary research links
         """
-        from urllib.parse import quote
-        
         encoded_title = quote(job_title)
         encoded_location = quote(location) if location else ''
         
@@ -540,7 +538,6 @@ class SourcingToolbox:
         
         if university:
             # Search for specific university
-            from urllib.parse import quote
             encoded_uni = quote(university)
             links[university] = f"https://www.linkedin.com/school/{encoded_uni}/people/"
         else: